@@ -1,6 +1,8 @@
 from collections import deque
+from functools import lru_cache
 import re
-from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 import warnings
 
 # Layout constants (pixels)
@@ -45,21 +47,43 @@ class CycleWarning(UserWarning):
     pass
 
 
+# Single-pass escaping: one regex alternation and a lookup per match, rather
+# than one full re.sub() scan per special character.
+_ESCAPE_RE = re.compile(r"[\\;,]|\$(?=[0-9])")
+_ESCAPES = {"\\": "\\\\", ";": " \\; ", ",": " \\, ", "$": "\\$"}
+
+# The reverse mapping. An escaped comma whose trailing space is shared with a
+# following escaped semicolon is left alone, matching the previous behaviour
+# of replacing all semicolons before any commas.
+_UNESCAPE_RE = re.compile(r" \\; | \\, (?!\\; )|(?<!\\)\\\$")
+_UNESCAPES = {" \\; ": "\n", " \\, ": ",", "\\$": "$"}
+
+
+def _escape_match(match: re.Match[str]) -> str:
+    return _ESCAPES[match.group()]
+
+
+def _unescape_match(match: re.Match[str]) -> str:
+    return _UNESCAPES[match.group()]
+
+
+@lru_cache(maxsize=4096)
 def escape(text: str) -> str:
-    """Escape special characters for PureData format."""
-    save = re.sub(r"\\", r"\\\\", text)
-    save = re.sub(r";", r" \; ", save)
-    save = re.sub(r",", r" \, ", save)
-    save = re.sub(r"\$(?=[0-9])", r"\$", save)
-    return save
+    """Escape special characters for PureData format.
+
+    Results are cached: patches repeat the same object and message texts
+    many times.
+    """
+    return _ESCAPE_RE.sub(_escape_match, text)
 
 
+@lru_cache(maxsize=4096)
 def unescape(text: str) -> str:
     """Unescape PureData format back to display text.
 
     Reverses the escaping done by ``escape()``: converts escaped semicolons
     back to newlines, escaped commas back to commas, and escaped dollar signs
-    back to plain dollar signs.
+    back to plain dollar signs. Results are cached like ``escape()``.
 
     Parameters
     ----------
@@ -71,9 +95,7 @@ def unescape(text: str) -> str:
     str
         Human-readable display text
     """
-    disp = re.sub(r" (?<!\\)\\; ", "\n", text)
-    disp = re.sub(r" (?<!\\)\\, ", ",", disp)
-    disp = re.sub(r"(?<!\\)\\\$", "$", disp)
+    disp = _UNESCAPE_RE.sub(_unescape_match, text)
     lines = [line.strip() for line in disp.split("\n")]
     return "\n".join(lines)
 
@@ -91,6 +113,32 @@ def get_display_lines(text: str) -> List[str]:
     return lines
 
 
+@lru_cache(maxsize=4096)
+def _text_dimensions(text: str) -> Tuple[int, int]:
+    """Return the (width, height) of a text box displaying *text*.
+
+    Cached by content: layout queries the anchor's dimensions on every
+    placement, and patches reuse the same object/message texts heavily.
+    """
+    display_lines = get_display_lines(text)
+    max_chars = max((len(line) for line in display_lines), default=0)
+    x_size = max(MIN_ELEMENT_WIDTH, ELEMENT_PADDING + max_chars * CHAR_WIDTH)
+    y_size = ELEMENT_BASE_HEIGHT + LINE_HEIGHT * len(display_lines)
+    return (x_size, y_size)
+
+
+@lru_cache(maxsize=4096)
+def _object_class_name(text: str) -> str:
+    """Return the class name (first token) of object box *text*, or ``""``.
+
+    Cached by text: the same object strings ("osc~ 440", "dac~", "+ 1")
+    recur throughout a patch. The result is interned, so registry lookups
+    and class-name comparisons hit the identity fast path.
+    """
+    parts = text.split(None, 1)
+    return sys.intern(parts[0]) if parts else ""
+
+
 class Node:
     """Represents one element in a PureData patch.
 
@@ -107,14 +155,18 @@ class Node:
         Used for connection validation.
     """
 
+    __slots__ = ("parameters", "_hidden", "_num_inlets", "_num_outlets")
+
     parameters: Dict[str, Any]
-    hidden: bool = False
-    num_inlets: Optional[int] = None
-    num_outlets: Optional[int] = None
+    _hidden: bool
+    _num_inlets: Optional[int]
+    _num_outlets: Optional[int]
 
     class Outlet:
         """Reference to a specific outlet of a Node, used for creating connections."""
 
+        __slots__ = ("owner", "index")
+
         owner: "Node"
         index: int
 
@@ -125,6 +177,38 @@ class Node:
         def __repr__(self) -> str:
             return f"Outlet({self.owner!r}, {self.index})"
 
+    def __init__(self) -> None:
+        self._hidden = False
+        self._num_inlets = None
+        self._num_outlets = None
+
+    # Slots cannot carry class-level defaults, so these properties supply
+    # them for subclasses that never set the flag or skip Node.__init__.
+
+    @property
+    def hidden(self) -> bool:
+        return getattr(self, "_hidden", False)
+
+    @hidden.setter
+    def hidden(self, value: bool) -> None:
+        self._hidden = value
+
+    @property
+    def num_inlets(self) -> Optional[int]:
+        return getattr(self, "_num_inlets", None)
+
+    @num_inlets.setter
+    def num_inlets(self, value: Optional[int]) -> None:
+        self._num_inlets = value
+
+    @property
+    def num_outlets(self) -> Optional[int]:
+        return getattr(self, "_num_outlets", None)
+
+    @num_outlets.setter
+    def num_outlets(self, value: Optional[int]) -> None:
+        self._num_outlets = value
+
     def __getitem__(self, key: int) -> "Node.Outlet":
         """Get an outlet reference for creating connections.
 
@@ -193,6 +277,8 @@ class Obj(Node):
         Number of outlets for connection validation
     """
 
+    __slots__ = ()
+
     parameters: Dict[str, Any]
 
     def __init__(
@@ -217,11 +303,7 @@ class Obj(Node):
 
     @property
     def dimensions(self) -> Tuple[int, int]:
-        display_lines = get_display_lines(self.parameters["text"])
-        max_chars = max((len(line) for line in display_lines), default=0)
-        x_size = max(MIN_ELEMENT_WIDTH, ELEMENT_PADDING + max_chars * CHAR_WIDTH)
-        y_size = ELEMENT_BASE_HEIGHT + LINE_HEIGHT * len(display_lines)
-        return (x_size, y_size)
+        return _text_dimensions(self.parameters["text"])
 
 
 class Msg(Node):
@@ -245,6 +327,8 @@ class Msg(Node):
         Number of outlets (default: 1)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -267,11 +351,7 @@ class Msg(Node):
 
     @property
     def dimensions(self) -> Tuple[int, int]:
-        display_lines = get_display_lines(self.parameters["text"])
-        max_chars = max((len(line) for line in display_lines), default=0)
-        x_size = max(MIN_ELEMENT_WIDTH, ELEMENT_PADDING + max_chars * CHAR_WIDTH)
-        y_size = ELEMENT_BASE_HEIGHT + LINE_HEIGHT * len(display_lines)
-        return (x_size, y_size)
+        return _text_dimensions(self.parameters["text"])
 
 
 class Float(Node):
@@ -301,6 +381,8 @@ class Float(Node):
         Send symbol for wireless output (default: ``'-'`` for none)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -347,6 +429,8 @@ class Float(Node):
 class Comment(Node):
     """A comment (#X text) - displays non-functional text in the patch."""
 
+    __slots__ = ()
+
     def __init__(self, x_pos: int, y_pos: int, content: str = "") -> None:
         self.parameters = {
             "x_pos": x_pos,
@@ -419,6 +503,8 @@ class Subpatch(Node):
         Height of the subpatch canvas in pixels
     """
 
+    __slots__ = ("src", "canvas_width", "canvas_height")
+
     src: "Patcher"
     canvas_width: int
     canvas_height: int
@@ -536,6 +622,8 @@ class Abstraction(Obj):
         Path to the .pd file on disk
     """
 
+    __slots__ = ("_source_path",)
+
     def __init__(
         self,
         x_pos: int,
@@ -551,8 +639,7 @@ class Abstraction(Obj):
     @property
     def name(self) -> str:
         """The abstraction name (first token of text)."""
-        text = self.parameters["text"]
-        return text.split()[0] if text else ""
+        return _object_class_name(self.parameters["text"])
 
     @property
     def source_path(self) -> Optional[str]:
@@ -564,6 +651,11 @@ class Abstraction(Obj):
         return f"Abstraction({p['x_pos']}, {p['y_pos']}, {p['text']!r})"
 
 
+# Object classes that define a (sub)patch's inlets and outlets.
+_INLET_CLASSES = frozenset({"inlet", "inlet~"})
+_OUTLET_CLASSES = frozenset({"outlet", "outlet~"})
+
+
 def _infer_abstraction_io(path: str) -> Tuple[int, int]:
     """Infer inlet/outlet counts from an abstraction's .pd file.
 
@@ -581,18 +673,16 @@ def _infer_abstraction_io(path: str) -> Tuple[int, int]:
     tuple of (int, int)
         (num_inlets, num_outlets)
     """
-    from .ast import PdObj, parse
+    from .ast import PdObj, parse_file
 
-    with open(path) as f:
-        content = f.read()
-    patch = parse(content)
+    patch = parse_file(path)
     num_inlets = 0
     num_outlets = 0
     for elem in patch.elements:
         if isinstance(elem, PdObj):
-            if elem.class_name in {"inlet", "inlet~"}:
+            if elem.class_name in _INLET_CLASSES:
                 num_inlets += 1
-            elif elem.class_name in {"outlet", "outlet~"}:
+            elif elem.class_name in _OUTLET_CLASSES:
                 num_outlets += 1
     return (num_inlets, num_outlets)
 
@@ -616,6 +706,8 @@ class Array(Node):
         If 1, save array contents with the patch (default: 0)
     """
 
+    __slots__ = ()
+
     def __init__(
         self, name: str, length: int, element_type: str = "float", save_flag: int = 0
     ) -> None:
@@ -669,6 +761,8 @@ class Bang(Node):
         Label text (default: 'empty')
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -746,6 +840,8 @@ class Toggle(Node):
         Value when toggled on (default: 1)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -812,6 +908,8 @@ class Symbol(Node):
     Similar to floatatom but for symbol (string) data instead of numbers.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -864,6 +962,8 @@ class NumberBox(Node):
     - More control over appearance
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -938,6 +1038,8 @@ class VSlider(Node):
     The slider outputs values between min and max as the user drags it.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -1009,6 +1111,8 @@ class VSlider(Node):
 class HSlider(Node):
     """Horizontal slider (hsl) - outputs values based on slider position."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -1083,6 +1187,8 @@ class VRadio(Node):
     Outputs the index (0 to number-1) of the selected button.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -1148,6 +1254,8 @@ class VRadio(Node):
 class HRadio(Node):
     """Horizontal radio buttons (hradio) - selects one of N options."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -1217,6 +1325,8 @@ class Canvas(Node):
     Useful for organizing patches visually with colored backgrounds.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -1278,6 +1388,8 @@ class VU(Node):
     No outlets - purely for display.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         x_pos: int,
@@ -1453,6 +1565,10 @@ PD_OBJECT_REGISTRY: Dict[str, Tuple[Optional[int], Optional[int]]] = {
     "midiout": (1, 0),
 }
 
+# Intern the keys so that lookups with the interned class names returned by
+# _object_class_name() match on identity before falling back to comparison.
+PD_OBJECT_REGISTRY = {sys.intern(name): counts for name, counts in PD_OBJECT_REGISTRY.items()}
+
 
 # Types that are never removed by optimize() -- they either have side effects
 # (send/receive, loadbang), carry user-visible information (Comment, Msg, GUI),
@@ -1490,6 +1606,29 @@ def _has_active_send_receive(node: Node) -> bool:
     return False
 
 
+# XML entity escapes for SVG text content, applied in one str.translate() pass.
+_SVG_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+# CSS class of each node's <rect> in to_svg(), keyed by exact node type.
+# Types not listed (Obj, Float, Comment, ...) use plain "node".
+_SVG_NODE_CLASS: Dict[type, str] = {
+    Msg: "node node-msg",
+    Subpatch: "node node-subpatch",
+    Bang: "node node-gui",
+    Toggle: "node node-gui",
+    VSlider: "node node-gui",
+    HSlider: "node node-gui",
+    VRadio: "node node-gui",
+    HRadio: "node node-gui",
+    NumberBox: "node node-gui",
+    Canvas: "node node-gui",
+    VU: "node node-gui",
+}
+
+# Line template for a connection: source, outlet, sink, inlet.
+_CONNECT_FMT = "#X connect %d %d %d %d;\n"
+
+
 class Connection:
     """A connection (patch cord) between two nodes.
 
@@ -1509,6 +1648,8 @@ class Connection:
         Inlet index on the sink node (0-based)
     """
 
+    __slots__ = ("source", "outlet_index", "sink", "inlet_index")
+
     source: int
     outlet_index: int
     sink: int
@@ -1521,7 +1662,7 @@ class Connection:
         self.inlet_index = inlet_index
 
     def __str__(self) -> str:
-        return f"#X connect {self.source} {self.outlet_index} {self.sink} {self.inlet_index};\n"
+        return _CONNECT_FMT % (self.source, self.outlet_index, self.sink, self.inlet_index)
 
     def __repr__(self) -> str:
         return f"Connection({self.source}, {self.outlet_index}, {self.sink}, {self.inlet_index})"
@@ -1678,11 +1819,13 @@ class LayoutManager:
         self.row_tail = node
 
         # Update row_head if:
+        # - Starting a new row (new_row >= 1)
+        # - Starting a new column (new_col > 0)
         # - Using absolute positioning
         # - First node (row_head is None)
-        # - Starting a new column (new_col > 0)
-        # - Starting a new row (new_row >= 1)
-        if was_absolute or self.row_head is None or new_col > 0 or new_row >= 1:
+        # The default placement (new_row=1) is tested first so the common
+        # case short-circuits after a single comparison.
+        if new_row >= 1 or new_col > 0 or was_absolute or self.row_head is None:
             self.row_head = node
 
     def place_node(
@@ -1774,8 +1917,7 @@ class GridLayoutManager(LayoutManager):
         if x_pos >= 0 and y_pos >= 0:
             return (x_pos, y_pos)
 
-        col = self.node_count % self.columns
-        row = self.node_count // self.columns
+        row, col = divmod(self.node_count, self.columns)
         return (
             self.default_margin + col * self.cell_width,
             self.default_margin + row * self.cell_height,
@@ -1835,6 +1977,9 @@ class Patcher:
         self.nodes = []
         self.connections = []
         self.layout = layout if layout is not None else LayoutManager()
+        # id(node) -> index into self.nodes; see _node_index()
+        self._index_cache: Dict[int, int] = {}
+        self._indexed_count = 0
 
     @property
     def row_head(self) -> Optional[Node]:
@@ -1856,15 +2001,20 @@ class Patcher:
 
     def _resolve_position(
         self, x_pos: int, y_pos: int, new_row: float, new_col: float
-    ) -> Tuple[int, int, Callable[[Node], None]]:
-        """Resolve position for a new element."""
+    ) -> Tuple[int, int, bool]:
+        """Resolve position for a new element.
+
+        Returns the computed ``(x, y)`` and whether the placement was
+        absolute, to be passed on to ``_append_node()``.
+        """
         was_absolute = x_pos >= 0 and y_pos >= 0
         computed_x, computed_y = self.layout.compute_position(new_row, new_col, x_pos, y_pos)
+        return (computed_x, computed_y, was_absolute)
 
-        def position_update(node: Node) -> None:
-            self.layout.register_node(node, new_row, new_col, was_absolute)
-
-        return (computed_x, computed_y, position_update)
+    def _append_node(self, node: Node, new_row: float, new_col: float, was_absolute: bool) -> None:
+        """Append a newly built node and register it with the layout manager."""
+        self.nodes.append(node)
+        self.layout.register_node(node, new_row, new_col, was_absolute)
 
     def add(
         self,
@@ -1921,7 +2071,7 @@ class Patcher:
         >>> dac = p.add('dac~')
         >>> p.link(osc, dac)
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
 
         if source_path is not None:
             # Abstraction: infer I/O from the .pd file when not given
@@ -1936,17 +2086,15 @@ class Patcher:
             node = Obj(x_pos, y_pos, text, num_inlets, num_outlets)
             # Auto-fill inlet/outlet counts from registry if not explicitly given
             if num_inlets is None or num_outlets is None:
-                text_parts = text.split()
-                class_name = text_parts[0] if text_parts else ""
-                if class_name in PD_OBJECT_REGISTRY:
-                    reg_in, reg_out = PD_OBJECT_REGISTRY[class_name]
+                counts = PD_OBJECT_REGISTRY.get(_object_class_name(text))
+                if counts is not None:
+                    reg_in, reg_out = counts
                     if num_inlets is None:
                         node.num_inlets = reg_in
                     if num_outlets is None:
                         node.num_outlets = reg_out
 
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_msg(
@@ -1970,10 +2118,9 @@ class Patcher:
         Msg
             The created message box
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = Msg(x_pos, y_pos, text)
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_float(
@@ -2012,10 +2159,9 @@ class Patcher:
         Float
             The created number box
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = Float(x_pos, y_pos, width, upper_limit, lower_limit, label, receive, send)
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_subpatch(
@@ -2100,21 +2246,22 @@ class Patcher:
             src.layout.row_height = self.layout.row_height
             src.layout.column_width = self.layout.column_width
 
-        # Auto-infer inlet/outlet counts from inner patch objects
-        if num_inlets is None:
-            num_inlets = sum(
-                1
-                for n in src.nodes
-                if isinstance(n, Obj) and n.parameters["text"].split()[0] in ("inlet", "inlet~")
-            )
-        if num_outlets is None:
-            num_outlets = sum(
-                1
-                for n in src.nodes
-                if isinstance(n, Obj) and n.parameters["text"].split()[0] in ("outlet", "outlet~")
-            )
+        # Auto-infer inlet/outlet counts from inner patch objects (one pass)
+        if num_inlets is None or num_outlets is None:
+            inlets = outlets = 0
+            for n in src.nodes:
+                if isinstance(n, Obj):
+                    class_name = _object_class_name(n.parameters["text"])
+                    if class_name in _INLET_CLASSES:
+                        inlets += 1
+                    elif class_name in _OUTLET_CLASSES:
+                        outlets += 1
+            if num_inlets is None:
+                num_inlets = inlets
+            if num_outlets is None:
+                num_outlets = outlets
 
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = Subpatch(
             x_pos,
             y_pos,
@@ -2129,8 +2276,7 @@ class Patcher:
             gop_width=gop_width,
             gop_height=gop_height,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_abstraction(
@@ -2177,7 +2323,7 @@ class Patcher:
             if num_outlets is None:
                 num_outlets = inferred_out
 
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = Abstraction(
             x_pos,
             y_pos,
@@ -2186,8 +2332,7 @@ class Patcher:
             num_outlets=num_outlets if num_outlets is not None else 0,
             source_path=source_path,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_array(self, name: str, length: int) -> Array:
@@ -2260,7 +2405,7 @@ class Patcher:
         node : Bang
             The created bang button
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = Bang(
             x_pos,
             y_pos,
@@ -2279,8 +2424,7 @@ class Patcher:
             fg_color=fg_color,
             label_color=label_color,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_toggle(
@@ -2323,7 +2467,7 @@ class Patcher:
         node : Toggle
             The created toggle button
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = Toggle(
             x_pos,
             y_pos,
@@ -2342,8 +2486,7 @@ class Patcher:
             init_value=init_value,
             default_value=default_value,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_symbol(
@@ -2373,7 +2516,7 @@ class Patcher:
         node : Symbol
             The created symbol box
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = Symbol(
             x_pos,
             y_pos,
@@ -2385,8 +2528,7 @@ class Patcher:
             send=send,
             receive=receive,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_numberbox(
@@ -2438,7 +2580,7 @@ class Patcher:
         node : NumberBox
             The created number box
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = NumberBox(
             x_pos,
             y_pos,
@@ -2461,8 +2603,7 @@ class Patcher:
             init_value=init_value,
             log_height=log_height,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_vslider(
@@ -2512,7 +2653,7 @@ class Patcher:
         node : VSlider
             The created vertical slider
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = VSlider(
             x_pos,
             y_pos,
@@ -2535,8 +2676,7 @@ class Patcher:
             init_value=init_value,
             steady=steady,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_hslider(
@@ -2586,7 +2726,7 @@ class Patcher:
         node : HSlider
             The created horizontal slider
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = HSlider(
             x_pos,
             y_pos,
@@ -2609,8 +2749,7 @@ class Patcher:
             init_value=init_value,
             steady=steady,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_vradio(
@@ -2651,7 +2790,7 @@ class Patcher:
         node : VRadio
             The created vertical radio buttons
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = VRadio(
             x_pos,
             y_pos,
@@ -2671,8 +2810,7 @@ class Patcher:
             label_color=label_color,
             init_value=init_value,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_hradio(
@@ -2713,7 +2851,7 @@ class Patcher:
         node : HRadio
             The created horizontal radio buttons
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = HRadio(
             x_pos,
             y_pos,
@@ -2733,8 +2871,7 @@ class Patcher:
             label_color=label_color,
             init_value=init_value,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_canvas(
@@ -2781,7 +2918,7 @@ class Patcher:
         node : Canvas
             The created canvas
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = Canvas(
             x_pos,
             y_pos,
@@ -2798,8 +2935,7 @@ class Patcher:
             bg_color=bg_color,
             label_color=label_color,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def add_vu(
@@ -2840,7 +2976,7 @@ class Patcher:
         node : VU
             The created VU meter
         """
-        x_pos, y_pos, pos_update = self._resolve_position(x_pos, y_pos, new_row, new_col)
+        x_pos, y_pos, was_absolute = self._resolve_position(x_pos, y_pos, new_row, new_col)
         node = VU(
             x_pos,
             y_pos,
@@ -2856,8 +2992,7 @@ class Patcher:
             label_color=label_color,
             scale=scale,
         )
-        self.nodes.append(node)
-        pos_update(node)
+        self._append_node(node, new_row, new_col, was_absolute)
         return node
 
     def link(
@@ -2896,18 +3031,61 @@ class Patcher:
         >>> p.link(osc[0], dac)        # same as above using Outlet syntax
         >>> p.link(osc, dac, inlet=1)  # connect osc outlet 0 -> dac inlet 1 (stereo)
         """
+        self.connections.append(self._make_connection(source, sink, outlet, inlet))
+
+    # Alias for symmetry with add_* methods
+    add_link = link
+
+    def add_links(self, links: Iterable[Sequence[Any]]) -> None:
+        """Connect several pairs of nodes in one call.
+
+        Parameters
+        ----------
+        links : iterable of tuple
+            Each item is ``(source, sink)``, ``(source, sink, outlet)`` or
+            ``(source, sink, outlet, inlet)``, with the same meaning as the
+            arguments of ``link()``. ``source`` may be a ``Node.Outlet``.
+
+        Raises
+        ------
+        NodeNotFoundError
+            If a source or sink is not in this patch
+        PdConnectionError
+            If an outlet or inlet index is out of range
+
+        Notes
+        -----
+        All links are validated before any are added: if one fails, the
+        patch's connections are left unchanged.
+
+        Example
+        -------
+        >>> p = Patcher()
+        >>> osc = p.add('osc~ 440')
+        >>> dac = p.add('dac~')
+        >>> p.add_links([(osc, dac), (osc, dac, 0, 1)])
+        """
+        make_connection = self._make_connection
+        self.connections.extend([make_connection(*spec) for spec in links])
+
+    def _make_connection(
+        self,
+        source: Union[Node, "Node.Outlet"],
+        sink: Node,
+        outlet: int = 0,
+        inlet: int = 0,
+    ) -> Connection:
+        """Internal: validate a link and build its Connection (see ``link()``)."""
         if isinstance(source, Node.Outlet):
             outlet = source.index
             source = source.owner
 
-        try:
-            source_index = self.nodes.index(source)
-        except ValueError:
+        source_index = self._node_index(source)
+        if source_index < 0:
             raise NodeNotFoundError(f"Source node {source!r} not found in patch")
 
-        try:
-            sink_index = self.nodes.index(sink)
-        except ValueError:
+        sink_index = self._node_index(sink)
+        if sink_index < 0:
             raise NodeNotFoundError(f"Sink node {sink!r} not found in patch")
 
         if source.num_outlets is not None and outlet >= source.num_outlets:
@@ -2921,10 +3099,37 @@ class Patcher:
                 f"(has {sink.num_inlets} inlet{'s' if sink.num_inlets != 1 else ''})"
             )
 
-        self.connections.append(Connection(source_index, outlet, sink_index, inlet))
+        return Connection(source_index, outlet, sink_index, inlet)
 
-    # Alias for symmetry with add_* methods
-    add_link = link
+    def _node_index(self, node: Node) -> int:
+        """Internal: return the index of *node* in ``self.nodes``, or -1.
+
+        Avoids the O(n) ``list.index()`` scan per ``link()`` call, which made
+        building large patches quadratic. ``self.nodes`` is a public list that
+        may be mutated directly, so every cache hit is verified by identity;
+        newly appended nodes are indexed incrementally and anything else
+        falls back to a full rebuild.
+        """
+        nodes = self.nodes
+        cache = self._index_cache
+        index = cache.get(id(node))
+        if index is not None and index < len(nodes) and nodes[index] is node:
+            return index
+
+        # Index nodes appended since the last lookup
+        for i in range(self._indexed_count, len(nodes)):
+            cache.setdefault(id(nodes[i]), i)
+        self._indexed_count = len(nodes)
+        index = cache.get(id(node))
+        if index is not None and index < len(nodes) and nodes[index] is node:
+            return index
+
+        # The list was modified in place; rebuild from scratch
+        cache.clear()
+        for i, n in enumerate(nodes):
+            cache.setdefault(id(n), i)
+        self._indexed_count = len(nodes)
+        return cache.get(id(node), -1)
 
     def __str__(self) -> str:
         return f"#N canvas 0 50 1000 600 10;\n{self._subpatch_str().rstrip()}"
@@ -2934,8 +3139,13 @@ class Patcher:
 
     def _subpatch_str(self) -> str:
         """Internal: generate string for patch contents."""
-        nodes_str = "".join(str(n) for n in self.nodes)
-        connections_str = "".join(str(c) for c in self.connections)
+        nodes_str = "".join([str(n) for n in self.nodes])
+        connections_str = "".join(
+            [
+                _CONNECT_FMT % (c.source, c.outlet_index, c.sink, c.inlet_index)
+                for c in self.connections
+            ]
+        )
         return f"{nodes_str}{connections_str}"
 
     def save(self, filename: Optional[str] = None) -> None:
@@ -2955,8 +3165,10 @@ class Patcher:
         fn = filename or self.filename
         if fn is None:
             raise ValueError("No filename specified. Provide filename or set in constructor.")
-        with open(fn, "w") as f:
-            f.write(str(self))
+        # Encode once and write in binary mode: a single write, no newline
+        # translation, and UTF-8 regardless of the platform locale.
+        with open(fn, "wb") as f:
+            f.write(str(self).encode("utf-8"))
 
     def validate_connections(self, check_cycles: bool = True) -> List[str]:
         """Validate all connections in the patch.
@@ -3054,6 +3266,11 @@ class Patcher:
         >>> c = patch.create_obj('delwrite~ delay', b[0])
         >>> cycles = patch.detect_cycles()  # May detect feedback loop
         """
+        # If every edge points to a later node, node order is a topological
+        # order and no cycle can exist -- the common case for built patches.
+        if all(conn.source < conn.sink for conn in self.connections):
+            return []
+
         # Build adjacency list
         adjacency: Dict[int, Set[int]] = {i: set() for i in range(len(self.nodes))}
         for conn in self.connections:
@@ -3109,15 +3326,13 @@ class Patcher:
                 "validation_coverage": 0.0,
             }
 
-        connected_nodes = set()
-        max_inlet = 0
-        max_outlet = 0
-
-        for conn in self.connections:
-            connected_nodes.add(conn.source)
-            connected_nodes.add(conn.sink)
-            max_inlet = max(max_inlet, conn.inlet_index)
-            max_outlet = max(max_outlet, conn.outlet_index)
+        # One comprehension per field, reduced with builtin set()/max(),
+        # rather than a loop calling max() twice per connection
+        connections = self.connections
+        connected_nodes = {conn.source for conn in connections}
+        connected_nodes.update([conn.sink for conn in connections])
+        max_inlet = max(0, max([conn.inlet_index for conn in connections]))
+        max_outlet = max(0, max([conn.outlet_index for conn in connections]))
 
         nodes_with_counts = sum(
             1 for n in self.nodes if n.num_inlets is not None or n.num_outlets is not None
@@ -3220,7 +3435,7 @@ class Patcher:
                     "width": width,
                     "height": node_height,
                     "text": text,
-                    "type": type(node).__name__,
+                    "css_class": _SVG_NODE_CLASS.get(type(node), "node"),
                 }
             )
 
@@ -3295,24 +3510,7 @@ class Patcher:
             w = int(info["width"])
             h = int(info["height"])
 
-            # Determine node class based on type
-            node_class = "node"
-            if info["type"] == "Msg":
-                node_class = "node node-msg"
-            elif info["type"] == "Subpatch":
-                node_class = "node node-subpatch"
-            elif info["type"] in (
-                "Bang",
-                "Toggle",
-                "VSlider",
-                "HSlider",
-                "VRadio",
-                "HRadio",
-                "NumberBox",
-                "Canvas",
-                "VU",
-            ):
-                node_class = "node node-gui"
+            node_class = info["css_class"]
 
             lines.append(
                 f'  <rect class="{node_class}" x="{x}" y="{y}" width="{w}" height="{h}" rx="2"/>'
@@ -3328,7 +3526,7 @@ class Patcher:
                 text_x = x + 4
                 text_y = y + h - 5
                 # Escape XML entities
-                text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+                text = text.translate(_SVG_ESCAPE_TABLE)
                 lines.append(f'  <text class="node-text" x="{text_x}" y="{text_y}">{text}</text>')
 
         lines.append("</svg>")
@@ -3574,14 +3772,15 @@ class Patcher:
 
         # Build adjacency lists
         n = len(self.nodes)
-        outgoing: Dict[int, Set[int]] = {i: set() for i in range(n)}
-        incoming: Dict[int, Set[int]] = {i: set() for i in range(n)}
+        outgoing: List[Set[int]] = [set() for _ in range(n)]
+        incoming: List[Set[int]] = [set() for _ in range(n)]
 
         for conn in self.connections:
             outgoing[conn.source].add(conn.sink)
             incoming[conn.sink].add(conn.source)
 
         # Detect back-edges via iterative DFS to break cycles
+        sorted_outgoing = [sorted(targets) for targets in outgoing]
         back_edges: Set[Tuple[int, int]] = set()
         visited: Set[int] = set()
         on_stack: Set[int] = set()
@@ -3592,7 +3791,7 @@ class Patcher:
             on_stack.add(start)
             while stack:
                 node_id, idx = stack[-1]
-                neighbors = sorted(outgoing[node_id])
+                neighbors = sorted_outgoing[node_id]
                 if idx < len(neighbors):
                     stack[-1] = (node_id, idx + 1)
                     neighbor = neighbors[idx]
@@ -3607,41 +3806,49 @@ class Patcher:
                     stack.pop()
 
         # Build DAG by excluding back-edges
-        dag_outgoing: Dict[int, Set[int]] = {i: set() for i in range(n)}
-        dag_incoming: Dict[int, Set[int]] = {i: set() for i in range(n)}
+        dag_outgoing: List[Set[int]] = [set() for _ in range(n)]
+        in_degree = [0] * n
         for i in range(n):
             for j in outgoing[i]:
                 if (i, j) not in back_edges:
                     dag_outgoing[i].add(j)
-                    dag_incoming[j].add(i)
-
-        # Calculate depth for each node using BFS from sources on the DAG
-        # Depth = longest path from any source to this node
-        depth: Dict[int, int] = {}
+                    in_degree[j] += 1
 
         # Find source nodes (no incoming connections in DAG)
-        sources = [i for i in range(n) if not dag_incoming[i] and not self.nodes[i].hidden]
+        sources = [i for i in range(n) if not in_degree[i] and not self.nodes[i].hidden]
 
         # If no clear sources, use all non-hidden nodes as potential starts
         if not sources:
             sources = [i for i in range(n) if not self.nodes[i].hidden]
 
-        # BFS to assign depths (on DAG, guaranteed to terminate)
-        queue: deque[int] = deque()
+        # Breadth-first discovery order from the sources; this fixes the
+        # left-to-right order of nodes within each row
+        order = list(sources)
+        seen = set(order)
+        for current in order:
+            for neighbor in dag_outgoing[current]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    order.append(neighbor)
 
+        # Depth = longest path from any source to this node. Relaxing edges
+        # in topological (Kahn) order visits each edge exactly once.
+        longest = [-1] * n
         for src in sources:
-            if src not in depth:
-                depth[src] = 0
-                queue.append(src)
-
+            longest[src] = 0
+        queue: deque[int] = deque(i for i in range(n) if not in_degree[i])
         while queue:
             current = queue.popleft()
+            current_depth = longest[current]
             for neighbor in dag_outgoing[current]:
-                new_depth = depth[current] + 1
-                if neighbor not in depth or depth[neighbor] < new_depth:
-                    depth[neighbor] = new_depth
+                if current_depth >= 0 and longest[neighbor] <= current_depth:
+                    longest[neighbor] = current_depth + 1
+                in_degree[neighbor] -= 1
+                if not in_degree[neighbor]:
                     queue.append(neighbor)
 
+        depth: Dict[int, int] = {i: max(longest[i], 0) for i in order}
+
         # Assign depth 0 to any remaining unvisited nodes
         for i in range(n):
             if i not in depth and not self.nodes[i].hidden:
@@ -16,7 +16,9 @@ Example usage:
 """
 
 from dataclasses import dataclass, field, replace
-from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+import re
+import sys
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union, cast
 
 if TYPE_CHECKING:
     from . import api
@@ -25,7 +27,7 @@ if TYPE_CHECKING:
 # AST Node Types
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Position:
     """2D position in the patch canvas."""
 
@@ -36,7 +38,7 @@ class Position:
         return f"{self.x} {self.y}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CanvasProperties:
     """Properties of a PureData canvas (main patch or subpatch)."""
 
@@ -54,13 +56,13 @@ class CanvasProperties:
         return f"{self.x} {self.y} {self.width} {self.height} {self.font_size}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdObj:
     """A PureData object (#X obj)."""
 
     position: Position
     class_name: str
-    args: Tuple[str, ...] = field(default_factory=tuple)
+    args: Tuple[str, ...] = ()
 
     @property
     def text(self) -> str:
@@ -70,10 +72,13 @@ class PdObj:
         return self.class_name
 
     def __str__(self) -> str:
-        return f"#X obj {self.position} {self.text};"
+        pos = self.position
+        if self.args:
+            return f"#X obj {pos.x} {pos.y} {self.class_name} {' '.join(self.args)};"
+        return f"#X obj {pos.x} {pos.y} {self.class_name};"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdMsg:
     """A PureData message box (#X msg)."""
 
@@ -81,10 +86,10 @@ class PdMsg:
     content: str
 
     def __str__(self) -> str:
-        return f"#X msg {self.position} {self.content};"
+        return f"#X msg {self.position.x} {self.position.y} {self.content};"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdFloatAtom:
     """A PureData number box (#X floatatom)."""
 
@@ -99,13 +104,13 @@ class PdFloatAtom:
 
     def __str__(self) -> str:
         return (
-            f"#X floatatom {self.position} {self.width} "
+            f"#X floatatom {self.position.x} {self.position.y} {self.width} "
             f"{self.lower_limit} {self.upper_limit} {self.label_pos} "
             f"{self.label} {self.receive} {self.send};"
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdSymbolAtom:
     """A PureData symbol box (#X symbolatom)."""
 
@@ -120,13 +125,13 @@ class PdSymbolAtom:
 
     def __str__(self) -> str:
         return (
-            f"#X symbolatom {self.position} {self.width} "
+            f"#X symbolatom {self.position.x} {self.position.y} {self.width} "
             f"{self.lower_limit} {self.upper_limit} {self.label_pos} "
             f"{self.label} {self.receive} {self.send};"
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdText:
     """A PureData comment (#X text)."""
 
@@ -134,10 +139,10 @@ class PdText:
     content: str
 
     def __str__(self) -> str:
-        return f"#X text {self.position} {self.content};"
+        return f"#X text {self.position.x} {self.position.y} {self.content};"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdArray:
     """A PureData array declaration (#X array)."""
 
@@ -150,7 +155,7 @@ class PdArray:
         return f"#X array {self.name} {self.size} {self.dtype} {self.save_flag};"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdConnect:
     """A connection between two objects (#X connect)."""
 
@@ -163,7 +168,7 @@ class PdConnect:
         return f"#X connect {self.source_id} {self.outlet_id} {self.sink_id} {self.inlet_id};"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdCoords:
     """Graph-on-parent coordinates (#X coords)."""
 
@@ -186,12 +191,12 @@ class PdCoords:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdDeclare:
     """A declare statement (#X declare) for search paths and libraries."""
 
-    paths: Tuple[str, ...] = field(default_factory=tuple)
-    libs: Tuple[str, ...] = field(default_factory=tuple)
+    paths: Tuple[str, ...] = ()
+    libs: Tuple[str, ...] = ()
     stdpath: bool = False
     stdlib: bool = False
 
@@ -208,7 +213,7 @@ class PdDeclare:
         return " ".join(parts) + ";"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdRestore:
     """Subpatch restore command (#X restore)."""
 
@@ -216,11 +221,11 @@ class PdRestore:
     name: str
 
     def __str__(self) -> str:
-        return f"#X restore {self.position} pd {self.name};"
+        return f"#X restore {self.position.x} {self.position.y} pd {self.name};"
 
 
 # GUI objects
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdBng:
     """Bang button (#X obj ... bng)."""
 
@@ -242,14 +247,14 @@ class PdBng:
 
     def __str__(self) -> str:
         return (
-            f"#X obj {self.position} bng {self.size} {self.hold} {self.interrupt} "
-            f"{self.init} {self.send} {self.receive} {self.label} "
+            f"#X obj {self.position.x} {self.position.y} bng {self.size} {self.hold} "
+            f"{self.interrupt} {self.init} {self.send} {self.receive} {self.label} "
             f"{self.label_x} {self.label_y} {self.font} {self.font_size} "
             f"{self.bg_color} {self.fg_color} {self.label_color};"
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdTgl:
     """Toggle button (#X obj ... tgl)."""
 
@@ -271,7 +276,7 @@ class PdTgl:
 
     def __str__(self) -> str:
         return (
-            f"#X obj {self.position} tgl {self.size} {self.init} "
+            f"#X obj {self.position.x} {self.position.y} tgl {self.size} {self.init} "
             f"{self.send} {self.receive} {self.label} "
             f"{self.label_x} {self.label_y} {self.font} {self.font_size} "
             f"{self.bg_color} {self.fg_color} {self.label_color} "
@@ -279,7 +284,7 @@ class PdTgl:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdNbx:
     """IEM number box (#X obj ... nbx)."""
 
@@ -305,7 +310,7 @@ class PdNbx:
 
     def __str__(self) -> str:
         return (
-            f"#X obj {self.position} nbx {self.width} {self.height} "
+            f"#X obj {self.position.x} {self.position.y} nbx {self.width} {self.height} "
             f"{self.min_val} {self.max_val} {self.log_flag} {self.init} "
             f"{self.send} {self.receive} {self.label} "
             f"{self.label_x} {self.label_y} {self.font} {self.font_size} "
@@ -314,7 +319,7 @@ class PdNbx:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdVsl:
     """Vertical slider (#X obj ... vsl)."""
 
@@ -340,7 +345,7 @@ class PdVsl:
 
     def __str__(self) -> str:
         return (
-            f"#X obj {self.position} vsl {self.width} {self.height} "
+            f"#X obj {self.position.x} {self.position.y} vsl {self.width} {self.height} "
             f"{self.min_val} {self.max_val} {self.log_flag} {self.init} "
             f"{self.send} {self.receive} {self.label} "
             f"{self.label_x} {self.label_y} {self.font} {self.font_size} "
@@ -349,7 +354,7 @@ class PdVsl:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdHsl:
     """Horizontal slider (#X obj ... hsl)."""
 
@@ -375,7 +380,7 @@ class PdHsl:
 
     def __str__(self) -> str:
         return (
-            f"#X obj {self.position} hsl {self.width} {self.height} "
+            f"#X obj {self.position.x} {self.position.y} hsl {self.width} {self.height} "
             f"{self.min_val} {self.max_val} {self.log_flag} {self.init} "
             f"{self.send} {self.receive} {self.label} "
             f"{self.label_x} {self.label_y} {self.font} {self.font_size} "
@@ -384,7 +389,7 @@ class PdHsl:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdVradio:
     """Vertical radio buttons (#X obj ... vradio)."""
 
@@ -407,14 +412,14 @@ class PdVradio:
 
     def __str__(self) -> str:
         return (
-            f"#X obj {self.position} vradio {self.size} {self.new_old} "
+            f"#X obj {self.position.x} {self.position.y} vradio {self.size} {self.new_old} "
             f"{self.init} {self.number} {self.send} {self.receive} {self.label} "
             f"{self.label_x} {self.label_y} {self.font} {self.font_size} "
             f"{self.bg_color} {self.fg_color} {self.label_color} {self.init_value};"
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdHradio:
     """Horizontal radio buttons (#X obj ... hradio)."""
 
@@ -437,14 +442,14 @@ class PdHradio:
 
     def __str__(self) -> str:
         return (
-            f"#X obj {self.position} hradio {self.size} {self.new_old} "
+            f"#X obj {self.position.x} {self.position.y} hradio {self.size} {self.new_old} "
             f"{self.init} {self.number} {self.send} {self.receive} {self.label} "
             f"{self.label_x} {self.label_y} {self.font} {self.font_size} "
             f"{self.bg_color} {self.fg_color} {self.label_color} {self.init_value};"
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdCnv:
     """IEM canvas (#X obj ... cnv)."""
 
@@ -464,14 +469,14 @@ class PdCnv:
 
     def __str__(self) -> str:
         return (
-            f"#X obj {self.position} cnv {self.size} {self.width} "
+            f"#X obj {self.position.x} {self.position.y} cnv {self.size} {self.width} "
             f"{self.height} {self.send} {self.receive} {self.label} "
             f"{self.label_x} {self.label_y} {self.font} {self.font_size} "
             f"{self.bg_color} {self.label_color} 0;"
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PdVu:
     """VU meter (#X obj ... vu)."""
 
@@ -490,7 +495,7 @@ class PdVu:
 
     def __str__(self) -> str:
         return (
-            f"#X obj {self.position} vu {self.width} {self.height} "
+            f"#X obj {self.position.x} {self.position.y} vu {self.width} {self.height} "
             f"{self.receive} {self.label} "
             f"{self.label_x} {self.label_y} {self.font} {self.font_size} "
             f"{self.bg_color} {self.label_color} {self.scale} 0;"
@@ -521,24 +526,92 @@ PdElement = Union[
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class PdSubpatch:
-    """A subpatch containing its own canvas and elements."""
+    """A subpatch containing its own canvas and elements.
+
+    ``coords`` is the subpatch's ``#X coords`` element (also kept in
+    ``elements``): the first one with graph-on-parent enabled, else the
+    first one. The parser records it while appending elements; if not
+    given, it is looked up from ``elements`` once on construction. It is
+    a cache of ``elements`` and is left out of comparison and repr; it is
+    not updated when ``elements`` changes afterwards.
+    """
 
     canvas: CanvasProperties
     elements: List[PdElement] = field(default_factory=list)
     restore: Optional[PdRestore] = None
+    coords: Optional[PdCoords] = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.coords is None:
+            self.coords = _find_coords(self.elements)
 
     def __str__(self) -> str:
         lines = [f"#N canvas {self.canvas};"]
-        for elem in self.elements:
-            lines.append(str(elem))
+        lines.extend(map(str, self.elements))
         if self.restore:
             lines.append(str(self.restore))
         return "\n".join(lines)
 
 
-@dataclass
+def _find_coords(elements: List[PdElement]) -> Optional[PdCoords]:
+    """Internal: scan elements for the coords ``PdSubpatch.coords`` records."""
+    coords = None
+    for elem in elements:
+        if isinstance(elem, PdCoords):
+            coords = _prefer_coords(coords, elem)
+    return coords
+
+
+def _prefer_coords(current: Optional[PdCoords], new: PdCoords) -> PdCoords:
+    """Internal: pick between a subpatch's known coords and a later one."""
+    if current is None or (current.graph_on_parent < 1 and new.graph_on_parent >= 1):
+        return new
+    return current
+
+
+# Element types that occupy an object index for #X connect
+_CONNECTABLE_TYPES = (
+    PdObj,
+    PdMsg,
+    PdFloatAtom,
+    PdSymbolAtom,
+    PdBng,
+    PdTgl,
+    PdNbx,
+    PdVsl,
+    PdHsl,
+    PdVradio,
+    PdHradio,
+    PdCnv,
+    PdVu,
+    PdSubpatch,
+)
+
+_ConnectableElement = Union[
+    PdObj,
+    PdMsg,
+    PdFloatAtom,
+    PdSymbolAtom,
+    PdBng,
+    PdTgl,
+    PdNbx,
+    PdVsl,
+    PdHsl,
+    PdVradio,
+    PdHradio,
+    PdCnv,
+    PdVu,
+    PdSubpatch,
+]
+
+# Exact-type answers for the shipped element classes; subclasses fall back to isinstance
+_CONNECTABLE_BY_TYPE: Dict[type, bool] = dict.fromkeys(_CONNECTABLE_TYPES, True)
+_CONNECTABLE_BY_TYPE.update(dict.fromkeys((PdText, PdArray, PdConnect, PdCoords, PdDeclare), False))
+
+
+@dataclass(slots=True)
 class PdPatch:
     """Root AST node representing a complete PureData patch."""
 
@@ -548,26 +621,7 @@ class PdPatch:
     def __str__(self) -> str:
         return serialize(self)
 
-    def get_objects(
-        self,
-    ) -> List[
-        Union[
-            PdObj,
-            PdMsg,
-            PdFloatAtom,
-            PdSymbolAtom,
-            PdBng,
-            PdTgl,
-            PdNbx,
-            PdVsl,
-            PdHsl,
-            PdVradio,
-            PdHradio,
-            PdCnv,
-            PdVu,
-            PdSubpatch,
-        ]
-    ]:
+    def get_objects(self) -> List[_ConnectableElement]:
         """Get all connectable objects (excludes connections, arrays, coords, and declares).
 
         Returns
@@ -576,29 +630,14 @@ class PdPatch:
             All elements that occupy an object index in PureData's connection
             numbering scheme.
         """
-        return [
+        by_type = _CONNECTABLE_BY_TYPE
+        objects = [
             e
             for e in self.elements
-            if isinstance(
-                e,
-                (
-                    PdObj,
-                    PdMsg,
-                    PdFloatAtom,
-                    PdSymbolAtom,
-                    PdBng,
-                    PdTgl,
-                    PdNbx,
-                    PdVsl,
-                    PdHsl,
-                    PdVradio,
-                    PdHradio,
-                    PdCnv,
-                    PdVu,
-                    PdSubpatch,
-                ),
-            )
+            if by_type.get(type(e))
+            or (type(e) not in by_type and isinstance(e, _CONNECTABLE_TYPES))
         ]
+        return cast(List[_ConnectableElement], objects)
 
     def get_connections(self) -> List[PdConnect]:
         """Get all connections in the patch."""
@@ -614,35 +653,14 @@ class ParseError(Exception):
     pass
 
 
+_TOKEN_RE = re.compile(r"(?:[^ \t;\\]+|\\.|\\\Z)+", re.DOTALL)
+
+
 def _tokenize(text: str) -> List[str]:
     """Tokenize a PureData line, respecting escaped characters and commas."""
-    tokens = []
-    current = []
-    i = 0
-    while i < len(text):
-        char = text[i]
-        if char == "\\" and i + 1 < len(text):
-            # Escaped character - keep the backslash and next char
-            current.append(char)
-            current.append(text[i + 1])
-            i += 2
-        elif char in " \t":
-            if current:
-                tokens.append("".join(current))
-                current = []
-            i += 1
-        elif char == ";":
-            if current:
-                tokens.append("".join(current))
-                current = []
-            # Don't include trailing semicolon in tokens
-            i += 1
-        else:
-            current.append(char)
-            i += 1
-    if current:
-        tokens.append("".join(current))
-    return tokens
+    # Runs of unescaped characters and backslash pairs form a token; spaces,
+    # tabs and the trailing semicolon separate them and are dropped.
+    return _TOKEN_RE.findall(text)
 
 
 def _parse_int(s: str, default: int = 0) -> int:
@@ -684,195 +702,235 @@ def _parse_canvas(tokens: List[str]) -> CanvasProperties:
         return CanvasProperties(x, y, width, height, font_size)
 
 
-def _parse_obj(tokens: List[str]) -> PdElement:
-    """Parse #X obj line."""
-    # #X obj x y class_name [args...]
-    if len(tokens) < 5:
-        raise ParseError(f"Invalid obj line: {tokens}")
+def _parse_bng(position: Position, args: Tuple[str, ...]) -> PdBng:
+    """Parse the arguments of a bng object."""
+    return PdBng(
+        position=position,
+        size=_parse_int(args[0], 15),
+        hold=_parse_int(args[1], 250),
+        interrupt=_parse_int(args[2], 50),
+        init=_parse_int(args[3], 0),
+        send=args[4] if len(args) > 4 else "empty",
+        receive=args[5] if len(args) > 5 else "empty",
+        label=args[6] if len(args) > 6 else "empty",
+        label_x=_parse_int(args[7], 17) if len(args) > 7 else 17,
+        label_y=_parse_int(args[8], 7) if len(args) > 8 else 7,
+        font=_parse_int(args[9], 0) if len(args) > 9 else 0,
+        font_size=_parse_int(args[10], 10) if len(args) > 10 else 10,
+        bg_color=_parse_int(args[11], -262144) if len(args) > 11 else -262144,
+        fg_color=_parse_int(args[12], -1) if len(args) > 12 else -1,
+        label_color=_parse_int(args[13], -1) if len(args) > 13 else -1,
+    )
 
-    pos = Position(_parse_int(tokens[2]), _parse_int(tokens[3]))
-    class_name = tokens[4]
-    args = tuple(tokens[5:]) if len(tokens) > 5 else ()
 
-    # Check for special GUI objects
-    if class_name == "bng" and len(args) >= 14:
-        return PdBng(
-            position=pos,
-            size=_parse_int(args[0], 15),
-            hold=_parse_int(args[1], 250),
-            interrupt=_parse_int(args[2], 50),
-            init=_parse_int(args[3], 0),
-            send=args[4] if len(args) > 4 else "empty",
-            receive=args[5] if len(args) > 5 else "empty",
-            label=args[6] if len(args) > 6 else "empty",
-            label_x=_parse_int(args[7], 17) if len(args) > 7 else 17,
-            label_y=_parse_int(args[8], 7) if len(args) > 8 else 7,
-            font=_parse_int(args[9], 0) if len(args) > 9 else 0,
-            font_size=_parse_int(args[10], 10) if len(args) > 10 else 10,
-            bg_color=_parse_int(args[11], -262144) if len(args) > 11 else -262144,
-            fg_color=_parse_int(args[12], -1) if len(args) > 12 else -1,
-            label_color=_parse_int(args[13], -1) if len(args) > 13 else -1,
-        )
-    elif class_name == "tgl" and len(args) >= 15:
-        return PdTgl(
-            position=pos,
-            size=_parse_int(args[0], 15),
-            init=_parse_int(args[1], 0),
-            send=args[2] if len(args) > 2 else "empty",
-            receive=args[3] if len(args) > 3 else "empty",
-            label=args[4] if len(args) > 4 else "empty",
-            label_x=_parse_int(args[5], 17) if len(args) > 5 else 17,
-            label_y=_parse_int(args[6], 7) if len(args) > 6 else 7,
-            font=_parse_int(args[7], 0) if len(args) > 7 else 0,
-            font_size=_parse_int(args[8], 10) if len(args) > 8 else 10,
-            bg_color=_parse_int(args[9], -262144) if len(args) > 9 else -262144,
-            fg_color=_parse_int(args[10], -1) if len(args) > 10 else -1,
-            label_color=_parse_int(args[11], -1) if len(args) > 11 else -1,
-            init_value=_parse_int(args[12], 0) if len(args) > 12 else 0,
-            default_value=_parse_int(args[13], 0) if len(args) > 13 else 0,
-        )
+def _parse_tgl(position: Position, args: Tuple[str, ...]) -> PdTgl:
+    """Parse the arguments of a tgl object."""
+    return PdTgl(
+        position=position,
+        size=_parse_int(args[0], 15),
+        init=_parse_int(args[1], 0),
+        send=args[2] if len(args) > 2 else "empty",
+        receive=args[3] if len(args) > 3 else "empty",
+        label=args[4] if len(args) > 4 else "empty",
+        label_x=_parse_int(args[5], 17) if len(args) > 5 else 17,
+        label_y=_parse_int(args[6], 7) if len(args) > 6 else 7,
+        font=_parse_int(args[7], 0) if len(args) > 7 else 0,
+        font_size=_parse_int(args[8], 10) if len(args) > 8 else 10,
+        bg_color=_parse_int(args[9], -262144) if len(args) > 9 else -262144,
+        fg_color=_parse_int(args[10], -1) if len(args) > 10 else -1,
+        label_color=_parse_int(args[11], -1) if len(args) > 11 else -1,
+        init_value=_parse_int(args[12], 0) if len(args) > 12 else 0,
+        default_value=_parse_int(args[13], 0) if len(args) > 13 else 0,
+    )
 
-    elif class_name == "nbx" and len(args) >= 18:
-        return PdNbx(
-            position=pos,
-            width=_parse_int(args[0], 5),
-            height=_parse_int(args[1], 14),
-            min_val=_parse_float(args[2], -1e37),
-            max_val=_parse_float(args[3], 1e37),
-            log_flag=_parse_int(args[4], 0),
-            init=_parse_int(args[5], 0),
-            send=args[6] if len(args) > 6 else "empty",
-            receive=args[7] if len(args) > 7 else "empty",
-            label=args[8] if len(args) > 8 else "empty",
-            label_x=_parse_int(args[9], 0),
-            label_y=_parse_int(args[10], -8),
-            font=_parse_int(args[11], 0),
-            font_size=_parse_int(args[12], 10),
-            bg_color=_parse_int(args[13], -262144),
-            fg_color=_parse_int(args[14], -1),
-            label_color=_parse_int(args[15], -1),
-            init_value=_parse_float(args[16], 0.0),
-            log_height=_parse_int(args[17], 256),
-        )
 
-    elif class_name == "vsl" and len(args) >= 18:
-        return PdVsl(
-            position=pos,
-            width=_parse_int(args[0], 15),
-            height=_parse_int(args[1], 128),
-            min_val=_parse_float(args[2], 0.0),
-            max_val=_parse_float(args[3], 127.0),
-            log_flag=_parse_int(args[4], 0),
-            init=_parse_int(args[5], 0),
-            send=args[6] if len(args) > 6 else "empty",
-            receive=args[7] if len(args) > 7 else "empty",
-            label=args[8] if len(args) > 8 else "empty",
-            label_x=_parse_int(args[9], 0),
-            label_y=_parse_int(args[10], -9),
-            font=_parse_int(args[11], 0),
-            font_size=_parse_int(args[12], 10),
-            bg_color=_parse_int(args[13], -262144),
-            fg_color=_parse_int(args[14], -1),
-            label_color=_parse_int(args[15], -1),
-            init_value=_parse_float(args[16], 0.0),
-            steady=_parse_int(args[17], 1),
-        )
+def _parse_nbx(position: Position, args: Tuple[str, ...]) -> PdNbx:
+    """Parse the arguments of a nbx object."""
+    return PdNbx(
+        position=position,
+        width=_parse_int(args[0], 5),
+        height=_parse_int(args[1], 14),
+        min_val=_parse_float(args[2], -1e37),
+        max_val=_parse_float(args[3], 1e37),
+        log_flag=_parse_int(args[4], 0),
+        init=_parse_int(args[5], 0),
+        send=args[6] if len(args) > 6 else "empty",
+        receive=args[7] if len(args) > 7 else "empty",
+        label=args[8] if len(args) > 8 else "empty",
+        label_x=_parse_int(args[9], 0),
+        label_y=_parse_int(args[10], -8),
+        font=_parse_int(args[11], 0),
+        font_size=_parse_int(args[12], 10),
+        bg_color=_parse_int(args[13], -262144),
+        fg_color=_parse_int(args[14], -1),
+        label_color=_parse_int(args[15], -1),
+        init_value=_parse_float(args[16], 0.0),
+        log_height=_parse_int(args[17], 256),
+    )
 
-    elif class_name == "hsl" and len(args) >= 18:
-        return PdHsl(
-            position=pos,
-            width=_parse_int(args[0], 128),
-            height=_parse_int(args[1], 15),
-            min_val=_parse_float(args[2], 0.0),
-            max_val=_parse_float(args[3], 127.0),
-            log_flag=_parse_int(args[4], 0),
-            init=_parse_int(args[5], 0),
-            send=args[6] if len(args) > 6 else "empty",
-            receive=args[7] if len(args) > 7 else "empty",
-            label=args[8] if len(args) > 8 else "empty",
-            label_x=_parse_int(args[9], -2),
-            label_y=_parse_int(args[10], -8),
-            font=_parse_int(args[11], 0),
-            font_size=_parse_int(args[12], 10),
-            bg_color=_parse_int(args[13], -262144),
-            fg_color=_parse_int(args[14], -1),
-            label_color=_parse_int(args[15], -1),
-            init_value=_parse_float(args[16], 0.0),
-            steady=_parse_int(args[17], 1),
-        )
 
-    elif class_name == "vradio" and len(args) >= 15:
-        return PdVradio(
-            position=pos,
-            size=_parse_int(args[0], 15),
-            new_old=_parse_int(args[1], 0),
-            init=_parse_int(args[2], 0),
-            number=_parse_int(args[3], 8),
-            send=args[4] if len(args) > 4 else "empty",
-            receive=args[5] if len(args) > 5 else "empty",
-            label=args[6] if len(args) > 6 else "empty",
-            label_x=_parse_int(args[7], 0),
-            label_y=_parse_int(args[8], -8),
-            font=_parse_int(args[9], 0),
-            font_size=_parse_int(args[10], 10),
-            bg_color=_parse_int(args[11], -262144),
-            fg_color=_parse_int(args[12], -1),
-            label_color=_parse_int(args[13], -1),
-            init_value=_parse_int(args[14], 0),
-        )
+def _parse_vsl(position: Position, args: Tuple[str, ...]) -> PdVsl:
+    """Parse the arguments of a vsl object."""
+    return PdVsl(
+        position=position,
+        width=_parse_int(args[0], 15),
+        height=_parse_int(args[1], 128),
+        min_val=_parse_float(args[2], 0.0),
+        max_val=_parse_float(args[3], 127.0),
+        log_flag=_parse_int(args[4], 0),
+        init=_parse_int(args[5], 0),
+        send=args[6] if len(args) > 6 else "empty",
+        receive=args[7] if len(args) > 7 else "empty",
+        label=args[8] if len(args) > 8 else "empty",
+        label_x=_parse_int(args[9], 0),
+        label_y=_parse_int(args[10], -9),
+        font=_parse_int(args[11], 0),
+        font_size=_parse_int(args[12], 10),
+        bg_color=_parse_int(args[13], -262144),
+        fg_color=_parse_int(args[14], -1),
+        label_color=_parse_int(args[15], -1),
+        init_value=_parse_float(args[16], 0.0),
+        steady=_parse_int(args[17], 1),
+    )
 
-    elif class_name == "hradio" and len(args) >= 15:
-        return PdHradio(
-            position=pos,
-            size=_parse_int(args[0], 15),
-            new_old=_parse_int(args[1], 0),
-            init=_parse_int(args[2], 0),
-            number=_parse_int(args[3], 8),
-            send=args[4] if len(args) > 4 else "empty",
-            receive=args[5] if len(args) > 5 else "empty",
-            label=args[6] if len(args) > 6 else "empty",
-            label_x=_parse_int(args[7], 0),
-            label_y=_parse_int(args[8], -8),
-            font=_parse_int(args[9], 0),
-            font_size=_parse_int(args[10], 10),
-            bg_color=_parse_int(args[11], -262144),
-            fg_color=_parse_int(args[12], -1),
-            label_color=_parse_int(args[13], -1),
-            init_value=_parse_int(args[14], 0),
-        )
 
-    elif class_name == "cnv" and len(args) >= 13:
-        return PdCnv(
-            position=pos,
-            size=_parse_int(args[0], 15),
-            width=_parse_int(args[1], 100),
-            height=_parse_int(args[2], 60),
-            send=args[3] if len(args) > 3 else "empty",
-            receive=args[4] if len(args) > 4 else "empty",
-            label=args[5] if len(args) > 5 else "empty",
-            label_x=_parse_int(args[6], 20),
-            label_y=_parse_int(args[7], 12),
-            font=_parse_int(args[8], 0),
-            font_size=_parse_int(args[9], 14),
-            bg_color=_parse_int(args[10], -233017),
-            label_color=_parse_int(args[11], -1),
-        )
+def _parse_hsl(position: Position, args: Tuple[str, ...]) -> PdHsl:
+    """Parse the arguments of a hsl object."""
+    return PdHsl(
+        position=position,
+        width=_parse_int(args[0], 128),
+        height=_parse_int(args[1], 15),
+        min_val=_parse_float(args[2], 0.0),
+        max_val=_parse_float(args[3], 127.0),
+        log_flag=_parse_int(args[4], 0),
+        init=_parse_int(args[5], 0),
+        send=args[6] if len(args) > 6 else "empty",
+        receive=args[7] if len(args) > 7 else "empty",
+        label=args[8] if len(args) > 8 else "empty",
+        label_x=_parse_int(args[9], -2),
+        label_y=_parse_int(args[10], -8),
+        font=_parse_int(args[11], 0),
+        font_size=_parse_int(args[12], 10),
+        bg_color=_parse_int(args[13], -262144),
+        fg_color=_parse_int(args[14], -1),
+        label_color=_parse_int(args[15], -1),
+        init_value=_parse_float(args[16], 0.0),
+        steady=_parse_int(args[17], 1),
+    )
+
+
+def _parse_vradio(position: Position, args: Tuple[str, ...]) -> PdVradio:
+    """Parse the arguments of a vradio object."""
+    return PdVradio(
+        position=position,
+        size=_parse_int(args[0], 15),
+        new_old=_parse_int(args[1], 0),
+        init=_parse_int(args[2], 0),
+        number=_parse_int(args[3], 8),
+        send=args[4] if len(args) > 4 else "empty",
+        receive=args[5] if len(args) > 5 else "empty",
+        label=args[6] if len(args) > 6 else "empty",
+        label_x=_parse_int(args[7], 0),
+        label_y=_parse_int(args[8], -8),
+        font=_parse_int(args[9], 0),
+        font_size=_parse_int(args[10], 10),
+        bg_color=_parse_int(args[11], -262144),
+        fg_color=_parse_int(args[12], -1),
+        label_color=_parse_int(args[13], -1),
+        init_value=_parse_int(args[14], 0),
+    )
 
-    elif class_name == "vu" and len(args) >= 12:
-        return PdVu(
-            position=pos,
-            width=_parse_int(args[0], 15),
-            height=_parse_int(args[1], 120),
-            receive=args[2] if len(args) > 2 else "empty",
-            label=args[3] if len(args) > 3 else "empty",
-            label_x=_parse_int(args[4], -1),
-            label_y=_parse_int(args[5], -8),
-            font=_parse_int(args[6], 0),
-            font_size=_parse_int(args[7], 10),
-            bg_color=_parse_int(args[8], -262144),
-            label_color=_parse_int(args[9], -1),
-            scale=_parse_int(args[10], 1),
-        )
+
+def _parse_hradio(position: Position, args: Tuple[str, ...]) -> PdHradio:
+    """Parse the arguments of a hradio object."""
+    return PdHradio(
+        position=position,
+        size=_parse_int(args[0], 15),
+        new_old=_parse_int(args[1], 0),
+        init=_parse_int(args[2], 0),
+        number=_parse_int(args[3], 8),
+        send=args[4] if len(args) > 4 else "empty",
+        receive=args[5] if len(args) > 5 else "empty",
+        label=args[6] if len(args) > 6 else "empty",
+        label_x=_parse_int(args[7], 0),
+        label_y=_parse_int(args[8], -8),
+        font=_parse_int(args[9], 0),
+        font_size=_parse_int(args[10], 10),
+        bg_color=_parse_int(args[11], -262144),
+        fg_color=_parse_int(args[12], -1),
+        label_color=_parse_int(args[13], -1),
+        init_value=_parse_int(args[14], 0),
+    )
+
+
+def _parse_cnv(position: Position, args: Tuple[str, ...]) -> PdCnv:
+    """Parse the arguments of a cnv object."""
+    return PdCnv(
+        position=position,
+        size=_parse_int(args[0], 15),
+        width=_parse_int(args[1], 100),
+        height=_parse_int(args[2], 60),
+        send=args[3] if len(args) > 3 else "empty",
+        receive=args[4] if len(args) > 4 else "empty",
+        label=args[5] if len(args) > 5 else "empty",
+        label_x=_parse_int(args[6], 20),
+        label_y=_parse_int(args[7], 12),
+        font=_parse_int(args[8], 0),
+        font_size=_parse_int(args[9], 14),
+        bg_color=_parse_int(args[10], -233017),
+        label_color=_parse_int(args[11], -1),
+    )
+
+
+def _parse_vu(position: Position, args: Tuple[str, ...]) -> PdVu:
+    """Parse the arguments of a vu object."""
+    return PdVu(
+        position=position,
+        width=_parse_int(args[0], 15),
+        height=_parse_int(args[1], 120),
+        receive=args[2] if len(args) > 2 else "empty",
+        label=args[3] if len(args) > 3 else "empty",
+        label_x=_parse_int(args[4], -1),
+        label_y=_parse_int(args[5], -8),
+        font=_parse_int(args[6], 0),
+        font_size=_parse_int(args[7], 10),
+        bg_color=_parse_int(args[8], -262144),
+        label_color=_parse_int(args[9], -1),
+        scale=_parse_int(args[10], 1),
+    )
+
+
+# GUI object parsers keyed by class name, with the minimum argument count
+# a saved object of that class carries
+_GUI_PARSERS: Dict[str, Tuple[int, Callable[[Position, Tuple[str, ...]], PdElement]]] = {
+    "bng": (14, _parse_bng),
+    "tgl": (15, _parse_tgl),
+    "nbx": (18, _parse_nbx),
+    "vsl": (18, _parse_vsl),
+    "hsl": (18, _parse_hsl),
+    "vradio": (15, _parse_vradio),
+    "hradio": (15, _parse_hradio),
+    "cnv": (13, _parse_cnv),
+    "vu": (12, _parse_vu),
+}
+
+
+def _parse_obj(tokens: List[str]) -> PdElement:
+    """Parse #X obj line."""
+    # #X obj x y class_name [args...]
+    if len(tokens) < 5:
+        raise ParseError(f"Invalid obj line: {tokens}")
+
+    pos = Position(_parse_int(tokens[2]), _parse_int(tokens[3]))
+    # Class names repeat heavily across a patch; interning lets them share
+    # one string object and its cached hash
+    class_name = sys.intern(tokens[4])
+    args = tuple(tokens[5:]) if len(tokens) > 5 else ()
+
+    # IEM GUI objects with their full argument list get a dedicated element
+    gui_parser = _GUI_PARSERS.get(class_name)
+    if gui_parser is not None and len(args) >= gui_parser[0]:
+        return gui_parser[1](pos, args)
 
     return PdObj(pos, class_name, args)
 
@@ -953,6 +1011,12 @@ def _parse_connect(tokens: List[str]) -> PdConnect:
     if len(tokens) < 6:
         raise ParseError(f"Invalid connect line: {tokens}")
 
+    # Connections are the most frequent statement; convert directly and only
+    # fall back to per-field defaults for malformed indices
+    try:
+        return PdConnect(int(tokens[2]), int(tokens[3]), int(tokens[4]), int(tokens[5]))
+    except ValueError:
+        pass
     return PdConnect(
         _parse_int(tokens[2]),
         _parse_int(tokens[3]),
@@ -1030,8 +1094,9 @@ def _preprocess(content: str) -> str:
     Handles line continuations (backslash at end of line) and
     normalizes line endings.
     """
-    # Normalize line endings
-    content = content.replace("\r\n", "\n").replace("\r", "\n")
+    # Normalize line endings (most patches are already LF-only)
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
 
     # Handle line continuations
     content = content.replace("\\\n", "")
@@ -1039,39 +1104,40 @@ def _preprocess(content: str) -> str:
     return content
 
 
+_STATEMENT_RE = re.compile(r"(?:[^\\;]+|\\.|\\\Z)*(?:;|\Z)", re.DOTALL)
+
+
 def _split_statements(content: str) -> List[str]:
     """Split content into individual PureData statements.
 
     Statements end with semicolons, but semicolons can be escaped.
     """
-    statements = []
-    current = []
-    i = 0
-
-    while i < len(content):
-        char = content[i]
-        if char == "\\" and i + 1 < len(content):
-            # Escaped character
-            current.append(char)
-            current.append(content[i + 1])
-            i += 2
-        elif char == ";":
-            current.append(char)
-            stmt = "".join(current).strip()
-            if stmt:
-                statements.append(stmt)
-            current = []
-            i += 1
-        else:
-            current.append(char)
-            i += 1
-
-    # Handle trailing content without semicolon
-    remaining = "".join(current).strip()
-    if remaining:
-        statements.append(remaining)
-
-    return statements
+    if "\\" not in content:
+        # Without escapes every semicolon ends a statement
+        *parts, remaining = content.split(";")
+        statements = [part.lstrip() + ";" for part in parts]
+        remaining = remaining.strip()
+        if remaining:
+            statements.append(remaining)
+        return statements
+
+    # Each match is one statement up to and including its terminating
+    # semicolon (or the end of the content for trailing text).
+    return [stmt for stmt in map(str.strip, _STATEMENT_RE.findall(content)) if stmt]
+
+
+# Parsers for #X statements that produce a single element, keyed by command
+_ELEMENT_PARSERS: Dict[str, Callable[[List[str]], PdElement]] = {
+    "obj": _parse_obj,
+    "msg": _parse_msg,
+    "floatatom": _parse_floatatom,
+    "symbolatom": _parse_symbolatom,
+    "text": _parse_text,
+    "array": _parse_array,
+    "connect": _parse_connect,
+    "coords": _parse_coords,
+    "declare": _parse_declare,
+}
 
 
 def parse(content: str) -> PdPatch:
@@ -1099,9 +1165,10 @@ def parse(content: str) -> PdPatch:
         raise ParseError("Empty patch file")
 
     # Parse using a stack for nested subpatches
-    patch_stack: List[Tuple[CanvasProperties, List[PdElement]]] = []
+    patch_stack: List[Tuple[CanvasProperties, List[PdElement], Optional[PdCoords]]] = []
     current_canvas: Optional[CanvasProperties] = None
     current_elements: List[PdElement] = []
+    current_coords: Optional[PdCoords] = None
 
     for stmt in statements:
         tokens = _tokenize(stmt)
@@ -1115,40 +1182,29 @@ def parse(content: str) -> PdPatch:
             canvas = _parse_canvas(tokens)
             if current_canvas is not None:
                 # Starting a subpatch - push current state
-                patch_stack.append((current_canvas, current_elements))
+                patch_stack.append((current_canvas, current_elements, current_coords))
                 current_elements = []
+                current_coords = None
             current_canvas = canvas
 
         elif directive == "#X":
             if current_canvas is None:
                 raise ParseError(f"Element before canvas: {stmt}")
 
-            if cmd == "obj":
-                current_elements.append(_parse_obj(tokens))
-            elif cmd == "msg":
-                current_elements.append(_parse_msg(tokens))
-            elif cmd == "floatatom":
-                current_elements.append(_parse_floatatom(tokens))
-            elif cmd == "symbolatom":
-                current_elements.append(_parse_symbolatom(tokens))
-            elif cmd == "text":
-                current_elements.append(_parse_text(tokens))
-            elif cmd == "array":
-                current_elements.append(_parse_array(tokens))
-            elif cmd == "connect":
-                current_elements.append(_parse_connect(tokens))
-            elif cmd == "coords":
-                current_elements.append(_parse_coords(tokens))
-            elif cmd == "declare":
-                current_elements.append(_parse_declare(tokens))
+            element_parser = _ELEMENT_PARSERS.get(cmd)
+            if element_parser is not None:
+                element = element_parser(tokens)
+                current_elements.append(element)
+                if isinstance(element, PdCoords):
+                    current_coords = _prefer_coords(current_coords, element)
             elif cmd == "restore":
                 # End of subpatch
                 restore = _parse_restore(tokens)
-                subpatch = PdSubpatch(current_canvas, current_elements, restore)
+                subpatch = PdSubpatch(current_canvas, current_elements, restore, current_coords)
 
                 if patch_stack:
                     # Pop parent state
-                    current_canvas, current_elements = patch_stack.pop()
+                    current_canvas, current_elements, current_coords = patch_stack.pop()
                     current_elements.append(subpatch)
                 else:
                     raise ParseError("Restore without matching canvas")
@@ -1181,8 +1237,9 @@ def parse_file(filepath: str) -> PdPatch:
     PdPatch
         The parsed AST
     """
-    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-        content = f.read()
+    # Read raw bytes and decode once; parse() normalizes line endings itself
+    with open(filepath, "rb") as f:
+        content = f.read().decode("utf-8", errors="replace")
     return parse(content)
 
 
@@ -1202,30 +1259,10 @@ def serialize(patch: PdPatch) -> str:
     str
         The PureData file content
     """
+    # PdSubpatch.__str__ serializes its own contents, so every element can be
+    # stringified uniformly
     lines = [f"#N canvas {patch.canvas};"]
-
-    for elem in patch.elements:
-        if isinstance(elem, PdSubpatch):
-            lines.append(_serialize_subpatch(elem))
-        else:
-            lines.append(str(elem))
-
-    return "\n".join(lines)
-
-
-def _serialize_subpatch(subpatch: PdSubpatch) -> str:
-    """Serialize a subpatch."""
-    lines = [f"#N canvas {subpatch.canvas};"]
-
-    for elem in subpatch.elements:
-        if isinstance(elem, PdSubpatch):
-            lines.append(_serialize_subpatch(elem))
-        else:
-            lines.append(str(elem))
-
-    if subpatch.restore:
-        lines.append(str(subpatch.restore))
-
+    lines.extend(map(str, patch.elements))
     return "\n".join(lines)
 
 
@@ -1240,8 +1277,9 @@ def serialize_to_file(patch: PdPatch, filepath: str) -> None:
         Path to the output .pd file
     """
     content = serialize(patch)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(content)
+    # Write UTF-8 with \n line endings on every platform, as Patcher.save() does
+    with open(filepath, "wb") as f:
+        f.write(content.encode("utf-8"))
 
 
 # Bridge functions between builder API and AST
@@ -1269,7 +1307,7 @@ def from_builder(patch: "api.Patcher") -> PdPatch:
         if isinstance(node, api.Obj):
             text = node.parameters["text"]
             parts = text.split(None, 1)
-            class_name = parts[0] if parts else ""
+            class_name = sys.intern(parts[0]) if parts else ""
             args = tuple(parts[1].split()) if len(parts) > 1 else ()
             pos = Position(node.parameters["x_pos"], node.parameters["y_pos"])
             elements.append(PdObj(pos, class_name, args))
@@ -1312,22 +1350,22 @@ def from_builder(patch: "api.Patcher") -> PdPatch:
             )
             restore = PdRestore(pos, p["name"])
             inner_elements = list(inner_ast.elements)
+            gop_coords = None
             if p["graph_on_parent"]:
-                inner_elements.append(
-                    PdCoords(
-                        0,
-                        1,
-                        1,
-                        0,
-                        p["gop_width"],
-                        p["gop_height"],
-                        1,
-                        int(p["hide_name"]),
-                        0,
-                        0,
-                    )
+                gop_coords = PdCoords(
+                    0,
+                    1,
+                    1,
+                    0,
+                    p["gop_width"],
+                    p["gop_height"],
+                    1,
+                    int(p["hide_name"]),
+                    0,
+                    0,
                 )
-            elements.append(PdSubpatch(subpatch_canvas, inner_elements, restore))
+                inner_elements.append(gop_coords)
+            elements.append(PdSubpatch(subpatch_canvas, inner_elements, restore, gop_coords))
 
         elif isinstance(node, api.Bang):
             p = node.parameters
@@ -1590,14 +1628,18 @@ def to_builder(ast: PdPatch) -> "api.Patcher":
 
     patch = api.Patcher()
 
-    # First pass: create all nodes (non-connections)
+    # First pass: create all nodes and collect connections
     node_map: List[Optional[api.Node]] = []  # Track nodes for linking
+    connects: List[PdConnect] = []  # Linked once all nodes exist
     node: api.Node
     for elem in ast.elements:
         if isinstance(elem, PdObj):
             node = patch.add(elem.text, x_pos=elem.position.x, y_pos=elem.position.y)
             node_map.append(node)
 
+        elif isinstance(elem, PdConnect):
+            connects.append(elem)
+
         elif isinstance(elem, PdMsg):
             node = patch.add_msg(elem.content, x_pos=elem.position.x, y_pos=elem.position.y)
             node_map.append(node)
@@ -1647,13 +1689,15 @@ def to_builder(ast: PdPatch) -> "api.Patcher":
             pos = elem.restore.position if elem.restore else Position(0, 0)
             # Extract GOP settings from PdCoords if present
             gop_kwargs: dict = {}
-            for sub_elem in elem.elements:
-                if isinstance(sub_elem, PdCoords) and sub_elem.graph_on_parent >= 1:
-                    gop_kwargs["graph_on_parent"] = True
-                    gop_kwargs["hide_name"] = bool(sub_elem.hide_name)
-                    gop_kwargs["gop_width"] = sub_elem.width
-                    gop_kwargs["gop_height"] = sub_elem.height
-                    break
+            coords = elem.coords
+            if coords not in elem.elements:
+                # Stale after elements were replaced or edited in place
+                coords = _find_coords(elem.elements)
+            if coords is not None and coords.graph_on_parent >= 1:
+                gop_kwargs["graph_on_parent"] = True
+                gop_kwargs["hide_name"] = bool(coords.hide_name)
+                gop_kwargs["gop_width"] = coords.width
+                gop_kwargs["gop_height"] = coords.height
             node = patch.add_subpatch(
                 name,
                 inner_patch,
@@ -1872,10 +1916,6 @@ def to_builder(ast: PdPatch) -> "api.Patcher":
             patch.nodes.append(node)
             node_map.append(node)
 
-        elif isinstance(elem, PdConnect):
-            # Skip connections in first pass
-            pass
-
         elif isinstance(elem, PdDeclare):
             # Declare has no builder equivalent; skip silently
             pass
@@ -1884,12 +1924,11 @@ def to_builder(ast: PdPatch) -> "api.Patcher":
             node_map.append(None)  # Placeholder for unknown elements
 
     # Second pass: add connections using link()
-    for elem in ast.elements:
-        if isinstance(elem, PdConnect):
-            source = node_map[elem.source_id] if elem.source_id < len(node_map) else None
-            sink = node_map[elem.sink_id] if elem.sink_id < len(node_map) else None
-            if source is not None and sink is not None:
-                patch.link(source, sink, outlet=elem.outlet_id, inlet=elem.inlet_id)
+    for conn in connects:
+        source = node_map[conn.source_id] if conn.source_id < len(node_map) else None
+        sink = node_map[conn.sink_id] if conn.sink_id < len(node_map) else None
+        if source is not None and sink is not None:
+            patch.link(source, sink, outlet=conn.outlet_id, inlet=conn.inlet_id)
 
     return patch
 
@@ -1913,19 +1952,24 @@ def transform(patch: PdPatch, transformer) -> PdPatch:
     PdPatch
         A new patch with transformed elements
     """
+    return PdPatch(patch.canvas, _transform_elements(patch.elements, transformer))
+
+
+def _transform_elements(elements: List[PdElement], transformer) -> List[PdElement]:
+    """Apply transformer to a list of elements, recursing into subpatches."""
     new_elements = []
-    for elem in patch.elements:
+    for elem in elements:
         if isinstance(elem, PdSubpatch):
-            # Recursively transform subpatch
-            inner = transform(PdPatch(elem.canvas, elem.elements), transformer)
-            transformed = transformer(PdSubpatch(elem.canvas, inner.elements, elem.restore))
+            # Recursively transform subpatch contents before the subpatch itself
+            inner = _transform_elements(elem.elements, transformer)
+            transformed = transformer(PdSubpatch(elem.canvas, inner, elem.restore))
         else:
             transformed = transformer(elem)
 
         if transformed is not None:
             new_elements.append(transformed)
 
-    return PdPatch(patch.canvas, new_elements)
+    return new_elements
 
 
 def find_objects(patch: PdPatch, predicate) -> List[PdElement]:
@@ -1944,15 +1988,38 @@ def find_objects(patch: PdPatch, predicate) -> List[PdElement]:
         All matching elements
     """
     results = []
-    for elem in patch.elements:
-        if predicate(elem):
-            results.append(elem)
-        if isinstance(elem, PdSubpatch):
-            # Recursively search subpatch
-            results.extend(find_objects(PdPatch(elem.canvas, elem.elements), predicate))
+    # Depth-first over a stack of element iterators, so subpatches are
+    # searched in place without wrapper patches or recursion
+    stack = [iter(patch.elements)]
+    while stack:
+        for elem in stack[-1]:
+            if predicate(elem):
+                results.append(elem)
+            if isinstance(elem, PdSubpatch):
+                stack.append(iter(elem.elements))
+                break
+        else:
+            stack.pop()
     return results
 
 
+# Element types whose send, receive and label fields are symbol names
+_GUI_WITH_SEND_RECEIVE_LABEL = (
+    PdSymbolAtom,
+    PdBng,
+    PdTgl,
+    PdNbx,
+    PdVsl,
+    PdHsl,
+    PdVradio,
+    PdHradio,
+    PdCnv,
+)
+
+# Object classes whose first argument is a send/receive name
+_SEND_RECEIVE_CLASSES = frozenset({"send", "s", "receive", "r", "send~", "s~", "receive~", "r~"})
+
+
 def rename_sends_receives(patch: PdPatch, old_name: str, new_name: str) -> PdPatch:
     """Rename all send/receive symbols in a patch.
 
@@ -1971,18 +2038,6 @@ def rename_sends_receives(patch: PdPatch, old_name: str, new_name: str) -> PdPat
         A new patch with renamed symbols
     """
 
-    _GUI_WITH_SEND_RECEIVE_LABEL = (
-        PdSymbolAtom,
-        PdBng,
-        PdTgl,
-        PdNbx,
-        PdVsl,
-        PdHsl,
-        PdVradio,
-        PdHradio,
-        PdCnv,
-    )
-
     def rename(elem: PdElement) -> Optional[PdElement]:
         if isinstance(elem, PdFloatAtom):
             return PdFloatAtom(
@@ -2010,16 +2065,7 @@ def rename_sends_receives(patch: PdPatch, old_name: str, new_name: str) -> PdPat
             )
         elif isinstance(elem, PdObj):
             # Check for send/receive objects
-            if elem.class_name in (
-                "send",
-                "s",
-                "receive",
-                "r",
-                "send~",
-                "s~",
-                "receive~",
-                "r~",
-            ):
+            if elem.class_name in _SEND_RECEIVE_CLASSES:
                 if elem.args and elem.args[0] == old_name:
                     return PdObj(elem.position, elem.class_name, (new_name,) + elem.args[1:])
         return elem
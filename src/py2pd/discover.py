@@ -105,42 +105,37 @@ def discover_externals(
     if include_defaults:
         paths.extend(default_search_paths())
 
-    platform = _platform_key()
-    binary_exts = _EXTERNAL_EXTENSIONS.get(platform, ())
+    # Resolved per call (not at import) so it follows sys.platform
+    binary_exts = frozenset(_EXTERNAL_EXTENSIONS.get(_platform_key(), ()))
 
     registry: ExternalsRegistry = {}
 
     for directory in paths:
-        if not os.path.isdir(directory):
-            continue
         try:
-            entries = os.listdir(directory)
+            scanner = os.scandir(directory)
         except OSError:
             continue
 
-        for entry in entries:
-            full_path = os.path.join(directory, entry)
-            if not os.path.isfile(full_path):
-                continue
-
-            # Check .pd abstractions
-            if entry.endswith(".pd"):
-                name = entry[:-3]
-                if name and name not in registry:
-                    try:
-                        inlets, outlets = _infer_abstraction_io(full_path)
-                        registry[name] = (inlets, outlets)
-                    except OSError:
+        with scanner:
+            for entry in scanner:
+                # Every recognized extension has a single dot, so the last
+                # dot-suffix classifies the entry
+                name, dot, ext = entry.name.rpartition(".")
+                if not name or name in registry:
+                    continue
+                is_abstraction = ext == "pd"
+                if not is_abstraction and dot + ext not in binary_exts:
+                    continue
+                try:
+                    if not entry.is_file():
                         continue
-                continue
-
-            # Check binary externals
-            for ext in binary_exts:
-                if entry.endswith(ext):
-                    name = entry[: -len(ext)]
-                    if name and name not in registry:
+                    if is_abstraction:
+                        inlets, outlets = _infer_abstraction_io(entry.path)
+                        registry[name] = (inlets, outlets)
+                    else:
                         registry[name] = (None, None)
-                    break
+                except OSError:
+                    continue
 
     return registry
 
@@ -161,14 +156,16 @@ def extract_declare_paths(patch: PdPatch) -> List[str]:
         All declared paths in the order encountered.
     """
     result: List[str] = []
-    _collect_declare_paths(patch.elements, result)
+    # Depth-first over a stack of element iterators, so declares inside a
+    # subpatch are collected where the subpatch appears
+    stack = [iter(patch.elements)]
+    while stack:
+        for elem in stack[-1]:
+            if isinstance(elem, PdDeclare):
+                result.extend(elem.paths)
+            elif isinstance(elem, PdSubpatch):
+                stack.append(iter(elem.elements))
+                break
+        else:
+            stack.pop()
     return result
-
-
-def _collect_declare_paths(elements: list, out: List[str]) -> None:
-    """Recursively collect declare paths from elements."""
-    for elem in elements:
-        if isinstance(elem, PdDeclare):
-            out.extend(elem.paths)
-        elif isinstance(elem, PdSubpatch):
-            _collect_declare_paths(elem.elements, out)
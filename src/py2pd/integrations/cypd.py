@@ -17,7 +17,6 @@ Usage::
 
 from dataclasses import dataclass, field
 import os
-import tempfile
 from typing import Optional, Sequence
 
 from ..api import Patcher
@@ -28,7 +27,7 @@ from ..ast import PdPatch, parse, serialize
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """Result of validating a PureData patch via libpd."""
 
@@ -56,11 +55,14 @@ class _PrintAccumulator:
         self.lines: list[str] = []
 
     def __call__(self, fragment: str) -> None:
-        self._buffer += fragment
-        while "\n" in self._buffer:
-            line, self._buffer = self._buffer.split("\n", 1)
-            if line:
-                self.lines.append(line)
+        if "\n" not in fragment:
+            self._buffer += fragment
+            return
+        # Split every completed line in one pass; the unterminated tail
+        # becomes the new buffer
+        lines = (self._buffer + fragment).split("\n")
+        self._buffer = lines.pop()
+        self.lines.extend(filter(None, lines))
 
     def flush(self) -> None:
         """Flush any remaining partial line."""
@@ -84,12 +86,24 @@ def _classify_messages(lines: list[str]) -> tuple[list[str], list[str]]:
     """
     errors: list[str] = []
     warnings: list[str] = []
+    # Clean logs are the common case: one substring scan per pattern over the
+    # whole log rules out every line at once (no pattern contains a newline)
+    log = "\n".join(lines).lower()
+    if not any(pat in log for pat in _ERROR_PATTERNS + _WARNING_PATTERNS):
+        return errors, warnings
+    # Plain loops rather than any(<genexpr>): no generator per line, and
+    # faster than a case-insensitive regex alternation over the same patterns
     for line in lines:
         lower = line.lower()
-        if any(pat in lower for pat in _ERROR_PATTERNS):
-            errors.append(line)
-        elif any(pat in lower for pat in _WARNING_PATTERNS):
-            warnings.append(line)
+        for pat in _ERROR_PATTERNS:
+            if pat in lower:
+                errors.append(line)
+                break
+        else:
+            for pat in _WARNING_PATTERNS:
+                if pat in lower:
+                    warnings.append(line)
+                    break
     return errors, warnings
 
 
@@ -181,6 +195,8 @@ def validate_patch(
     """
     _ensure_libpd()
 
+    import tempfile
+
     import cypd
 
     content = _serialize_input(patch)
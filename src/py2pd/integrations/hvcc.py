@@ -28,9 +28,8 @@ Usage::
 from dataclasses import dataclass, field
 from enum import Enum
 import os
-import subprocess
-import tempfile
-from typing import Optional, Sequence, Union
+import sys
+from typing import Iterator, Optional, Sequence, Union
 
 from ..api import LayoutManager, Obj, Patcher, Subpatch
 from ..ast import PdObj, PdPatch, PdSubpatch, serialize
@@ -235,6 +234,11 @@ HVCC_MIDI_OBJECTS: set[str] = {
     "polytouchout",
 }
 
+# Parsed class names are interned (see ``py2pd.ast``); interning the registry
+# entries lets set lookups match them by identity instead of comparing text.
+HVCC_SUPPORTED_OBJECTS = set(map(sys.intern, HVCC_SUPPORTED_OBJECTS))
+HVCC_MIDI_OBJECTS = set(map(sys.intern, HVCC_MIDI_OBJECTS))
+
 HVCC_MIDI_GENERATORS: frozenset[str] = frozenset({"dpf", "daisy", "owl"})
 
 # ---------------------------------------------------------------------------
@@ -282,7 +286,7 @@ class HvccGenerator(str, Enum):
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class HvccValidationResult:
     """Result of validating a patch for hvcc compatibility."""
 
@@ -291,6 +295,29 @@ class HvccValidationResult:
     warnings: list[str] = field(default_factory=list)
 
 
+def _object_error(
+    class_name: str,
+    generators: Sequence[HvccGenerator] | None = None,
+) -> Optional[str]:
+    """Return the hvcc error for a single object name, or None if supported."""
+    if class_name not in HVCC_SUPPORTED_OBJECTS:
+        return f"unsupported object: {class_name}"
+    # HvccGenerator members hash and compare as their string values, so the
+    # frozenset can be probed with members and plain strings alike.
+    if (
+        generators
+        and class_name in HVCC_MIDI_OBJECTS
+        and HVCC_MIDI_GENERATORS.isdisjoint(generators)
+    ):
+        gen_values = {g.value if isinstance(g, HvccGenerator) else g for g in generators}
+        return (
+            f"MIDI object '{class_name}' requires a generator that supports MIDI "
+            f"({', '.join(sorted(HVCC_MIDI_GENERATORS))}), "
+            f"but generators are: {', '.join(sorted(gen_values))}"
+        )
+    return None
+
+
 def _check_object_supported(
     class_name: str,
     generators: Sequence[HvccGenerator] | None = None,
@@ -299,61 +326,47 @@ def _check_object_supported(
 
     Returns a list of error strings (empty if supported).
     """
-    errors: list[str] = []
-    if class_name not in HVCC_SUPPORTED_OBJECTS:
-        errors.append(f"unsupported object: {class_name}")
-        return errors
-    if generators and class_name in HVCC_MIDI_OBJECTS:
-        gen_values = {g.value if isinstance(g, HvccGenerator) else g for g in generators}
-        if not gen_values & HVCC_MIDI_GENERATORS:
-            errors.append(
-                f"MIDI object '{class_name}' requires a generator that supports MIDI "
-                f"({', '.join(sorted(HVCC_MIDI_GENERATORS))}), "
-                f"but generators are: {', '.join(sorted(gen_values))}"
-            )
-    return errors
-
-
-def _walk_builder_nodes(patch: Patcher) -> list[str]:
-    """Extract object class names from a Patcher, recursing into subpatches."""
-    names: list[str] = []
-    _walk_builder_nodes_into(patch, names)
-    return names
-
-
-def _walk_builder_nodes_into(patch: Patcher, names: list[str]) -> None:
-    """Recursive helper for _walk_builder_nodes."""
-    for node in patch.nodes:
-        if isinstance(node, Subpatch):
-            _walk_builder_nodes_into(node.src, names)
-            continue
-        if isinstance(node, Obj):
-            text = node.parameters.get("text", "")
-            parts = text.split()
-            if parts:
-                names.append(parts[0])
-
-
-def _walk_ast_nodes(patch: PdPatch) -> list[str]:
-    """Extract object class names from a PdPatch AST, recursing into subpatches."""
-    names: list[str] = []
-    _walk_ast_elements(patch.elements, names)
-    return names
-
-
-def _walk_ast_elements(elements: list, names: list[str]) -> None:
-    """Recursive helper for _walk_ast_nodes."""
-    for elem in elements:
-        if isinstance(elem, PdObj):
-            names.append(elem.class_name)
-        elif isinstance(elem, PdSubpatch):
-            _walk_ast_elements(elem.elements, names)
+    error = _object_error(class_name, generators)
+    return [] if error is None else [error]
+
+
+def _walk_builder_nodes(patch: Patcher) -> Iterator[str]:
+    """Yield object class names from a Patcher, recursing into subpatches."""
+    # Depth-first over a stack of iterators, so deep nesting needs no recursion
+    stack = [iter(patch.nodes)]
+    while stack:
+        for node in stack[-1]:
+            if isinstance(node, Subpatch):
+                stack.append(iter(node.src.nodes))
+                break
+            if isinstance(node, Obj):
+                text = node.parameters.get("text", "")
+                parts = text.split(None, 1)
+                if parts:
+                    yield parts[0]
+        else:
+            stack.pop()
+
+
+def _walk_ast_nodes(patch: PdPatch) -> Iterator[str]:
+    """Yield object class names from a PdPatch AST, recursing into subpatches."""
+    stack = [iter(patch.elements)]
+    while stack:
+        for elem in stack[-1]:
+            if isinstance(elem, PdObj):
+                yield elem.class_name
+            elif isinstance(elem, PdSubpatch):
+                stack.append(iter(elem.elements))
+                break
+        else:
+            stack.pop()
 
 
 def validate_for_hvcc(
     patch: Union[Patcher, PdPatch],
     *,
     generators: Sequence[HvccGenerator] | None = None,
+    fail_fast: bool = False,
 ) -> HvccValidationResult:
     """Validate a patch for hvcc compatibility.
 
@@ -368,6 +381,9 @@ def validate_for_hvcc(
     generators : sequence of HvccGenerator, optional
         Target generators.  If provided, MIDI objects are checked for
         generator compatibility.
+    fail_fast : bool, optional
+        If True, stop walking the patch at the first error, so ``errors``
+        holds at most one entry.  Useful when only ``ok`` is needed.
 
     Returns
     -------
@@ -384,9 +400,13 @@ def validate_for_hvcc(
     errors: list[str] = []
     warnings: list[str] = []
 
+    # _object_error() rather than _check_object_supported(): no list per object
     for name in class_names:
-        errs = _check_object_supported(name, generators)
-        errors.extend(errs)
+        error = _object_error(name, generators)
+        if error is not None:
+            errors.append(error)
+            if fail_fast:
+                break
 
     return HvccValidationResult(
         ok=len(errors) == 0,
@@ -455,10 +475,10 @@ class HeavyPatcher(Patcher):
         Obj
             The created object
         """
-        parts = text.split()
+        # Only the class name is needed; stop splitting after the first word
+        parts = text.split(None, 1)
         class_name = parts[0] if parts else ""
-        errs = _check_object_supported(class_name, self.generators)
-        if errs:
+        if _object_error(class_name, self.generators) is not None:
             raise HvccUnsupportedError([class_name])
         return super().add(
             text,
@@ -589,7 +609,7 @@ class HeavyPatcher(Patcher):
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class HvccCompileResult:
     """Result of running the hvcc compiler."""
 
@@ -674,6 +694,10 @@ def compile_hvcc(
     else:
         raise TypeError(f"Expected Patcher or PdPatch, got {type(patch).__name__}")
 
+    # Imported here so validation-only users never pay for them
+    import subprocess
+    import tempfile
+
     tmp_path: str | None = None
     try:
         with tempfile.NamedTemporaryFile(mode="w", suffix=".pd", delete=False) as tmp:
@@ -0,0 +1,15 @@
+import pytest
+
+from py2pd import Patcher
+
+
+@pytest.fixture
+def osc_dac_patch():
+    """A fresh Patcher holding ``osc~ 440`` followed by ``dac~``.
+
+    Returns the ``(patch, osc, dac)`` tuple.
+    """
+    patch = Patcher()
+    osc = patch.add("osc~ 440")
+    dac = patch.add("dac~")
+    return patch, osc, dac
@@ -93,6 +93,12 @@ class TestEscape:
         assert "\\\\" in result
         assert "\\$1" in result
 
+    def test_escape_cached(self):
+        escape.cache_clear()
+        first = escape("set $1; bang")
+        assert escape("set $1; bang") is first
+        assert escape.cache_info().hits == 1
+
 
 class TestUnescape:
     """Tests for the unescape function."""
@@ -111,6 +117,20 @@ class TestUnescape:
         result = unescape("  hello  ")
         assert result == "hello"
 
+    def test_unescape_round_trip(self):
+        assert unescape(escape("set $1, bang; 2")) == "set $1, bang\n2"
+
+    def test_unescape_semicolon_wins_shared_space(self):
+        # An escaped comma sharing its trailing space with an escaped
+        # semicolon is left as-is; the semicolon is converted.
+        assert unescape(" \\, \\; ") == "\\,\n"
+
+    def test_unescape_cached(self):
+        unescape.cache_clear()
+        unescape("a \\; b")
+        unescape("a \\; b")
+        assert unescape.cache_info().hits == 1
+
 
 class TestGetDisplayLines:
     """Tests for the get_display_lines function."""
@@ -197,6 +217,57 @@ class TestNode:
         assert "Outlet" in repr_str
         assert "0" in repr_str
 
+    def test_outlet_has_no_instance_dict(self):
+        patch = Patcher()
+        outlet = patch.add("test")[0]
+        assert not hasattr(outlet, "__dict__")
+
+    def test_nodes_have_no_instance_dict(self):
+        patch = Patcher()
+        nodes = [
+            patch.add("osc~ 440"),
+            patch.add_msg("bang"),
+            patch.add_float(),
+            patch.add_array("table", 8),
+            patch.add_bang(),
+            patch.add_toggle(),
+            patch.add_vu(),
+            patch.add_subpatch("inner", Patcher()),
+            Comment(0, 0, "note"),
+            Abstraction(0, 0, "my-abs", 1, 1),
+        ]
+        for node in nodes:
+            assert not hasattr(node, "__dict__"), type(node).__name__
+
+    def test_custom_subclass_defaults_counts_to_none(self):
+        class MyNode(Node):
+            def __init__(self, x_pos, y_pos):
+                self.parameters = {"x_pos": x_pos, "y_pos": y_pos}
+
+            def __str__(self):
+                return f"#X obj {self.parameters['x_pos']} {self.parameters['y_pos']} mine;\n"
+
+        patch = Patcher()
+        custom = MyNode(0, 0)
+        patch.nodes.append(custom)
+        plus = patch.add("+ 1")
+        assert custom.num_inlets is None
+        assert custom.num_outlets is None
+        patch.link(custom[3], plus)
+        patch.link(plus, custom, inlet=5)
+        assert len(patch.connections) == 2
+        assert custom.hidden is False
+        with pytest.raises(AttributeError):
+            custom.missing_attribute
+
+    def test_hidden_assignable_on_plain_node(self):
+        patch = Patcher()
+        osc = patch.add("osc~ 440")
+        assert osc.hidden is False
+        osc.hidden = True
+        assert osc.hidden is True
+        assert osc.position == (-1, -1)
+
 
 class TestObj:
     """Tests for Obj class."""
@@ -231,6 +302,12 @@ class TestObj:
         long_obj = Obj(0, 0, "x" * 50)
         assert long_obj.dimensions[0] > short_obj.dimensions[0]
 
+    def test_dimensions_follow_text_mutation(self):
+        obj = Obj(0, 0, "x")
+        before = obj.dimensions
+        obj.parameters["text"] = "x" * 50
+        assert obj.dimensions[0] > before[0]
+
     def test_escapes_text(self):
         obj = Obj(0, 0, "test;with;semicolons")
         assert "\\;" in str(obj)
@@ -743,6 +820,12 @@ class TestConnection:
         assert "2" in repr_str
         assert "1" in repr_str
 
+    def test_slots(self):
+        conn = Connection(0, 0, 1, 0)
+        assert not hasattr(conn, "__dict__")
+        with pytest.raises(AttributeError):
+            conn.extra = 1
+
 
 class TestPatcher:
     """Tests for Patcher class."""
@@ -887,6 +970,27 @@ class TestPatcher:
         with pytest.raises(NodeNotFoundError):
             patch1.link(obj1, obj2)
 
+    def test_link_many_nodes(self):
+        patch = Patcher()
+        nodes = [patch.add(f"f {i}") for i in range(200)]
+        for a, b in zip(nodes, nodes[1:]):
+            patch.link(a, b)
+        assert len(patch.connections) == 199
+        last = patch.connections[-1]
+        assert (last.source, last.sink) == (198, 199)
+
+    def test_link_after_direct_node_mutation(self):
+        patch = Patcher()
+        a = patch.add("a")
+        b = patch.add("b")
+        c = patch.add("c")
+        patch.link(a, b)
+        patch.nodes.remove(a)
+        patch.link(b, c)
+        assert str(patch.connections[-1]) == "#X connect 0 0 1 0;\n"
+        with pytest.raises(NodeNotFoundError):
+            patch.link(a, c)
+
     def test_filename_in_constructor(self):
         patch = Patcher("test.pd")
         assert patch.filename == "test.pd"
@@ -1443,6 +1547,27 @@ class TestCycleDetection:
         cycles = patch.detect_cycles()
         assert len(cycles) >= 1
 
+    def test_backward_edge_without_cycle(self):
+        patch = Patcher()
+        a = patch.add("a")
+        b = patch.add("b")
+        c = patch.add("c")
+        patch.link(c, a)
+        patch.link(a, b)
+        assert patch.detect_cycles() == []
+
+    def test_cycle_through_backward_edge(self):
+        patch = Patcher()
+        a = patch.add("a")
+        b = patch.add("b")
+        c = patch.add("c")
+        patch.link(a, b)
+        patch.link(b, c)
+        patch.link(c, a)
+        cycles = patch.detect_cycles()
+        assert len(cycles) == 1
+        assert set(cycles[0]) == {0, 1, 2}
+
     def test_validate_with_cycle_warning(self):
         patch = Patcher()
         a = patch.add("a")
@@ -1596,10 +1721,8 @@ class TestSVGExport:
         assert "<rect" in svg
         assert "osc~ 440" in svg
 
-    def test_to_svg_with_connections(self):
-        patch = Patcher()
-        osc = patch.add("osc~ 440")
-        dac = patch.add("dac~")
+    def test_to_svg_with_connections(self, osc_dac_patch):
+        patch, osc, dac = osc_dac_patch
         patch.link(osc, dac)
         svg = patch.to_svg()
         assert '<path class="connection"' in svg
@@ -1628,6 +1751,12 @@ class TestSVGExport:
         assert "&gt;" in svg
         assert "&amp;" in svg
 
+    def test_to_svg_escapes_quotes(self):
+        patch = Patcher()
+        patch.add_msg('say "hi"')
+        svg = patch.to_svg()
+        assert "say &quot;hi&quot;" in svg
+
     def test_to_svg_show_labels_false(self):
         patch = Patcher()
         patch.add("osc~ 440")
@@ -1672,11 +1801,9 @@ class TestSVGExport:
         assert "osc~ 440" in svg
         # Array should not appear visually (it's hidden)
 
-    def test_add_link_alias(self):
+    def test_add_link_alias(self, osc_dac_patch):
         """Test that add_link works as alias for link."""
-        patch = Patcher()
-        osc = patch.add("osc~ 440")
-        dac = patch.add("dac~")
+        patch, osc, dac = osc_dac_patch
         patch.add_link(osc, dac)  # Using alias
         assert len(patch.connections) == 1
 
@@ -1719,6 +1846,16 @@ class TestSave:
         content = arg_path.read_text()
         assert "osc~ 440" in content
 
+    def test_save_utf8_lf(self, tmp_path):
+        patch = Patcher()
+        patch.add_msg("caf\u00e9")
+        patch.add("dac~")
+        filepath = tmp_path / "utf8.pd"
+        patch.save(str(filepath))
+        data = filepath.read_bytes()
+        assert "caf\u00e9".encode("utf-8") in data
+        assert b"\r\n" not in data
+
 
 class TestGridLayoutManager:
     """Tests for GridLayoutManager."""
@@ -1822,6 +1959,19 @@ class TestAutoLayout:
         assert branch1.position[1] == branch2.position[1]
         assert branch1.position[1] < mixer.position[1]
 
+    def test_auto_layout_longest_path_depth(self):
+        patch = Patcher()
+        nodes = [patch.add(f"n{i}") for i in range(4)]
+        patch.link(nodes[0], nodes[3])
+        patch.link(nodes[0], nodes[1])
+        patch.link(nodes[1], nodes[2])
+        patch.link(nodes[2], nodes[3])
+
+        patch.auto_layout(margin=0, row_spacing=10)
+
+        # The skip edge 0 -> 3 must not pull node 3 up
+        assert [n.position[1] for n in nodes] == [0, 10, 20, 30]
+
     def test_auto_layout_empty_patch(self):
         patch = Patcher()
         patch.auto_layout()  # Should not raise
@@ -1943,10 +2093,8 @@ class TestComment:
 class TestLinkWithOutlet:
     """Tests for link() accepting Node.Outlet objects."""
 
-    def test_link_with_outlet_index_zero(self):
-        patch = Patcher()
-        osc = patch.add("osc~ 440")
-        dac = patch.add("dac~")
+    def test_link_with_outlet_index_zero(self, osc_dac_patch):
+        patch, osc, dac = osc_dac_patch
         patch.link(osc[0], dac)
         assert len(patch.connections) == 1
         conn = patch.connections[0]
@@ -1963,10 +2111,8 @@ class TestLinkWithOutlet:
         conn = patch.connections[0]
         assert conn.outlet_index == 1
 
-    def test_link_outlet_with_inlet(self):
-        patch = Patcher()
-        osc = patch.add("osc~ 440")
-        dac = patch.add("dac~")
+    def test_link_outlet_with_inlet(self, osc_dac_patch):
+        patch, osc, dac = osc_dac_patch
         patch.link(osc[0], dac, inlet=1)
         conn = patch.connections[0]
         assert conn.outlet_index == 0
@@ -1981,17 +2127,58 @@ class TestLinkWithOutlet:
         conn = patch.connections[0]
         assert conn.outlet_index == 2
 
-    def test_link_with_node_still_works(self):
+    def test_link_with_node_still_works(self, osc_dac_patch):
         """Passing a plain Node should still work as before."""
-        patch = Patcher()
-        osc = patch.add("osc~ 440")
-        dac = patch.add("dac~")
+        patch, osc, dac = osc_dac_patch
         patch.link(osc, dac, outlet=0, inlet=1)
         conn = patch.connections[0]
         assert conn.outlet_index == 0
         assert conn.inlet_index == 1
 
 
+class TestAddLinks:
+    """Tests for bulk connection via add_links()."""
+
+    def test_add_links_matches_link(self):
+        patch = Patcher()
+        osc = patch.add("osc~ 440")
+        gain = patch.add("*~ 0.5")
+        dac = patch.add("dac~")
+        patch.add_links([(osc, gain), (gain, dac), (gain, dac, 0, 1)])
+
+        expected = Patcher()
+        e_osc = expected.add("osc~ 440")
+        e_gain = expected.add("*~ 0.5")
+        e_dac = expected.add("dac~")
+        expected.link(e_osc, e_gain)
+        expected.link(e_gain, e_dac)
+        expected.link(e_gain, e_dac, inlet=1)
+
+        assert str(patch) == str(expected)
+
+    def test_add_links_with_outlet(self):
+        patch = Patcher()
+        obj = patch.add("unknown_multi_out", num_outlets=3)
+        dac = patch.add("dac~")
+        patch.add_links([(obj[2], dac, 0, 1)])
+        conn = patch.connections[0]
+        assert (conn.outlet_index, conn.inlet_index) == (2, 1)
+
+    def test_add_links_empty(self):
+        patch = Patcher()
+        patch.add_links([])
+        assert patch.connections == []
+
+    def test_add_links_is_atomic(self, osc_dac_patch):
+        patch, osc, dac = osc_dac_patch
+        other = Patcher().add("foreign")
+        with pytest.raises(NodeNotFoundError):
+            patch.add_links([(osc, dac), (other, dac)])
+        with pytest.raises(PdConnectionError):
+            patch.add_links([(osc, dac), (osc, dac, 0, 5)])
+        assert patch.connections == []
+
+
 class TestSubpatchAutoInference:
     """Tests for auto-inferring subpatch num_inlets/num_outlets."""
 
@@ -2042,6 +2229,25 @@ class TestSubpatchAutoInference:
         assert sp.num_inlets == 1
         assert sp.num_outlets == 1
 
+    def test_partial_override(self):
+        inner = Patcher()
+        inner.add("inlet")
+        inner.add("outlet~")
+        inner.add("outlet")
+        patch = Patcher()
+        sp = patch.add_subpatch("test", inner, num_inlets=4)
+        assert sp.num_inlets == 4
+        assert sp.num_outlets == 2
+
+    def test_empty_object_text(self):
+        inner = Patcher()
+        inner.add("")
+        inner.add("inlet")
+        patch = Patcher()
+        sp = patch.add_subpatch("test", inner)
+        assert sp.num_inlets == 1
+        assert sp.num_outlets == 0
+
 
 class TestPdObjectRegistry:
     """Tests for PD_OBJECT_REGISTRY and auto-fill in add()."""
@@ -2097,6 +2303,13 @@ class TestPdObjectRegistry:
         assert "send" in PD_OBJECT_REGISTRY
         assert "receive" in PD_OBJECT_REGISTRY
 
+    def test_registry_changes_seen_by_repeated_add(self, monkeypatch):
+        patch = Patcher()
+        assert patch.add("my-ext 1").num_inlets is None
+        monkeypatch.setitem(PD_OBJECT_REGISTRY, "my-ext", (3, 2))
+        obj = patch.add("my-ext 1")
+        assert (obj.num_inlets, obj.num_outlets) == (3, 2)
+
 
 class TestGOP:
     """Tests for Graph-on-Parent support on Subpatch."""
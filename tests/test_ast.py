@@ -1,8 +1,5 @@
 """Tests for py2pd.ast module."""
 
-import os
-import tempfile
-
 import pytest
 
 from py2pd import (
@@ -35,12 +32,14 @@ from py2pd.ast import (
     PdSubpatch,
     PdSymbolAtom,
     PdText,
+    PdTgl,
     PdVradio,
     PdVsl,
     PdVu,
     Position,
     _preprocess,
     _split_statements,
+    _tokenize,
     find_objects,
     rename_sends_receives,
     transform,
@@ -187,6 +186,18 @@ class TestPdPatch:
         objects = patch.get_objects()
         assert len(objects) == 2  # obj and msg, not connect
 
+    def test_get_objects_includes_subclasses(self):
+        class CustomObj(PdObj):
+            pass
+
+        class CustomText(PdText):
+            pass
+
+        custom = CustomObj(Position(25, 25), "osc~")
+        elements = [custom, CustomText(Position(25, 50), "note"), PdConnect(0, 0, 1, 0)]
+        patch = PdPatch(CanvasProperties(), elements)
+        assert patch.get_objects() == [custom]
+
     def test_get_connections(self):
         elements = [
             PdObj(Position(25, 25), "osc~"),
@@ -215,6 +226,25 @@ class TestParser:
         assert isinstance(patch.elements[1], PdObj)
         assert isinstance(patch.elements[2], PdConnect)
 
+    def test_parse_interns_class_names(self):
+        content = """#N canvas 0 50 450 300 10;
+#X obj 50 50 osc~ 440;
+#X obj 50 100 osc~ 220;"""
+
+        patch = parse(content)
+        assert patch.elements[0].class_name is patch.elements[1].class_name
+
+    def test_parsed_elements_have_no_instance_dict(self):
+        content = """#N canvas 0 50 450 300 10;
+#X obj 50 50 osc~ 440;
+#X msg 50 80 bang;
+#X obj 50 110 vu 15 120 empty empty -1 -8 0 10 -66577 -1 1 0;
+#X connect 0 0 1 0;"""
+
+        patch = parse(content)
+        for elem in [patch, patch.canvas, patch.elements[0].position, *patch.elements]:
+            assert not hasattr(elem, "__dict__"), type(elem).__name__
+
     def test_parse_message(self):
         content = """#N canvas 0 50 450 300 10;
 #X msg 50 50 bang;"""
@@ -370,36 +400,49 @@ class TestRoundTrip:
         assert len(subpatches) == 1
 
 
+@pytest.fixture(scope="module")
+def pd_dir(tmp_path_factory):
+    """Directory shared by the file I/O tests in this module."""
+    return tmp_path_factory.mktemp("pd_io")
+
+
 class TestFileIO:
     """Tests for file I/O functions."""
 
-    def test_parse_file(self):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".pd", delete=False) as f:
-            f.write("#N canvas 0 50 1000 600 10;\n")
-            f.write("#X obj 50 50 osc~ 440;\n")
-            filepath = f.name
+    def test_parse_file(self, pd_dir):
+        filepath = pd_dir / "parse.pd"
+        filepath.write_text("#N canvas 0 50 1000 600 10;\n#X obj 50 50 osc~ 440;\n")
 
-        try:
-            ast = parse_file(filepath)
-            assert len(ast.elements) == 1
-            assert isinstance(ast.elements[0], PdObj)
-        finally:
-            os.unlink(filepath)
+        ast = parse_file(str(filepath))
+        assert len(ast.elements) == 1
+        assert isinstance(ast.elements[0], PdObj)
 
-    def test_serialize_to_file(self):
+    def test_serialize_to_file(self, pd_dir):
         elements = [PdObj(Position(50, 50), "osc~", ("440",))]
         patch = PdPatch(CanvasProperties(), elements)
+        filepath = pd_dir / "serialize.pd"
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".pd", delete=False) as f:
-            filepath = f.name
+        serialize_to_file(patch, str(filepath))
+        assert "#X obj 50 50 osc~ 440;" in filepath.read_text()
 
-        try:
-            serialize_to_file(patch, filepath)
-            with open(filepath, "r") as f:
-                content = f.read()
-            assert "#X obj 50 50 osc~ 440;" in content
-        finally:
-            os.unlink(filepath)
+    def test_parse_file_crlf_and_invalid_utf8(self, pd_dir):
+        filepath = pd_dir / "crlf.pd"
+        filepath.write_bytes(b"#N canvas 0 50 1000 600 10;\r\n#X text 10 10 caf\xe9;\r\n")
+
+        ast = parse_file(str(filepath))
+        assert ast.elements[0] == PdText(Position(10, 10), "caf\ufffd")
+
+    def test_serialize_to_file_utf8_lf(self, pd_dir):
+        patch = PdPatch(
+            CanvasProperties(),
+            [PdText(Position(10, 10), "café"), PdObj(Position(10, 40), "dac~")],
+        )
+        filepath = pd_dir / "utf8.pd"
+
+        serialize_to_file(patch, str(filepath))
+        data = filepath.read_bytes()
+        assert b"\r" not in data
+        assert data.decode("utf-8") == serialize(patch)
 
 
 class TestBridgeFromBuilder:
@@ -449,90 +492,30 @@ class TestBridgeFromBuilder:
         ast = from_builder(patch)
         assert isinstance(ast.elements[0], PdSubpatch)
 
-    def test_from_builder_with_bang(self):
-        patch = Patcher()
-        patch.add_bang(size=20, send="s1", receive="r1")
-        ast = from_builder(patch)
-        from py2pd.ast import PdBng
-
-        assert isinstance(ast.elements[0], PdBng)
-        assert ast.elements[0].size == 20
-        assert ast.elements[0].send == "s1"
-        assert ast.elements[0].receive == "r1"
-
-    def test_from_builder_with_toggle(self):
-        patch = Patcher()
-        patch.add_toggle(size=25, default_value=5)
-        ast = from_builder(patch)
-        from py2pd.ast import PdTgl
-
-        assert isinstance(ast.elements[0], PdTgl)
-        assert ast.elements[0].size == 25
-        assert ast.elements[0].default_value == 5
-
-    def test_from_builder_with_symbol(self):
-        patch = Patcher()
-        patch.add_symbol(width=15)
-        ast = from_builder(patch)
-        from py2pd.ast import PdSymbolAtom
-
-        assert isinstance(ast.elements[0], PdSymbolAtom)
-        assert ast.elements[0].width == 15
-
-    def test_from_builder_with_numberbox(self):
-        patch = Patcher()
-        patch.add_numberbox(width=8, min_val=0, max_val=100)
-        ast = from_builder(patch)
-        assert isinstance(ast.elements[0], PdNbx)
-        assert ast.elements[0].width == 8
-        assert ast.elements[0].min_val == 0
-        assert ast.elements[0].max_val == 100
-
-    def test_from_builder_with_vslider(self):
-        patch = Patcher()
-        patch.add_vslider(width=20, height=150)
-        ast = from_builder(patch)
-        assert isinstance(ast.elements[0], PdVsl)
-        assert ast.elements[0].width == 20
-        assert ast.elements[0].height == 150
-
-    def test_from_builder_with_hslider(self):
-        patch = Patcher()
-        patch.add_hslider(width=200, height=20)
-        ast = from_builder(patch)
-        assert isinstance(ast.elements[0], PdHsl)
-        assert ast.elements[0].width == 200
-        assert ast.elements[0].height == 20
-
-    def test_from_builder_with_vradio(self):
-        patch = Patcher()
-        patch.add_vradio(number=4)
-        ast = from_builder(patch)
-        assert isinstance(ast.elements[0], PdVradio)
-        assert ast.elements[0].number == 4
-
-    def test_from_builder_with_hradio(self):
-        patch = Patcher()
-        patch.add_hradio(number=6)
-        ast = from_builder(patch)
-        assert isinstance(ast.elements[0], PdHradio)
-        assert ast.elements[0].number == 6
-
-    def test_from_builder_with_canvas(self):
+    @pytest.mark.parametrize(
+        "method, kwargs, pd_cls",
+        [
+            ("add_bang", {"size": 20, "send": "s1", "receive": "r1"}, PdBng),
+            ("add_toggle", {"size": 25, "default_value": 5}, PdTgl),
+            ("add_symbol", {"width": 15}, PdSymbolAtom),
+            ("add_numberbox", {"width": 8, "min_val": 0, "max_val": 100}, PdNbx),
+            ("add_vslider", {"width": 20, "height": 150}, PdVsl),
+            ("add_hslider", {"width": 200, "height": 20}, PdHsl),
+            ("add_vradio", {"number": 4}, PdVradio),
+            ("add_hradio", {"number": 6}, PdHradio),
+            ("add_canvas", {"width": 200, "height": 100}, PdCnv),
+            ("add_vu", {"width": 20, "height": 150}, PdVu),
+        ],
+    )
+    def test_from_builder_with_gui(self, method, kwargs, pd_cls):
         patch = Patcher()
-        patch.add_canvas(width=200, height=100)
+        getattr(patch, method)(**kwargs)
         ast = from_builder(patch)
-        assert isinstance(ast.elements[0], PdCnv)
-        assert ast.elements[0].width == 200
-        assert ast.elements[0].height == 100
 
-    def test_from_builder_with_vu(self):
-        patch = Patcher()
-        patch.add_vu(width=20, height=150)
-        ast = from_builder(patch)
-        assert isinstance(ast.elements[0], PdVu)
-        assert ast.elements[0].width == 20
-        assert ast.elements[0].height == 150
+        elem = ast.elements[0]
+        assert isinstance(elem, pd_cls)
+        for name, value in kwargs.items():
+            assert getattr(elem, name) == value
 
 
 class TestBridgeToBuilder:
@@ -758,6 +741,28 @@ class TestTransform:
         result = transform(patch, remove_print)
         assert len(result.elements) == 1
 
+    def test_transform_subpatch_contents_first(self):
+        inner = [PdObj(Position(0, 0), "print"), PdObj(Position(0, 30), "osc~")]
+        restore = PdRestore(Position(10, 10), "sub")
+        subpatch = PdSubpatch(CanvasProperties(0, 0, 300, 200), inner, restore)
+        patch = PdPatch(CanvasProperties(), [subpatch])
+        seen = []
+
+        def remove_print(elem):
+            seen.append(elem)
+            if isinstance(elem, PdObj) and elem.class_name == "print":
+                return None
+            return elem
+
+        result = transform(patch, remove_print)
+        new_sub = result.elements[0]
+        assert isinstance(new_sub, PdSubpatch)
+        assert [e.class_name for e in new_sub.elements] == ["osc~"]
+        assert new_sub.restore is restore
+        assert seen[-1] is new_sub
+        # The original subpatch is left untouched
+        assert len(subpatch.elements) == 2
+
 
 class TestFindObjects:
     """Tests for find_objects function."""
@@ -785,6 +790,31 @@ class TestFindObjects:
         oscillators = find_objects(patch, lambda e: isinstance(e, PdObj) and e.class_name == "osc~")
         assert len(oscillators) == 1
 
+    def test_find_depth_first_order(self):
+        canvas = CanvasProperties(0, 0, 300, 200)
+        inner = PdSubpatch(canvas, [PdObj(Position(0, 0), "b")], PdRestore(Position(0, 0), "i"))
+        outer = PdSubpatch(
+            canvas,
+            [inner, PdObj(Position(0, 0), "c")],
+            PdRestore(Position(0, 0), "o"),
+        )
+        patch = PdPatch(
+            CanvasProperties(), [PdObj(Position(0, 0), "a"), outer, PdObj(Position(0, 0), "d")]
+        )
+
+        found = find_objects(patch, lambda e: isinstance(e, PdObj))
+        assert [e.class_name for e in found] == ["a", "b", "c", "d"]
+
+    def test_find_in_deeply_nested_subpatches(self):
+        canvas = CanvasProperties(0, 0, 300, 200)
+        elem = PdSubpatch(canvas, [PdObj(Position(0, 0), "osc~")], PdRestore(Position(0, 0), "s"))
+        for _ in range(2000):
+            elem = PdSubpatch(canvas, [elem], PdRestore(Position(0, 0), "s"))
+        patch = PdPatch(CanvasProperties(), [elem])
+
+        assert len(find_objects(patch, lambda e: isinstance(e, PdObj))) == 1
+        assert len(find_objects(patch, lambda e: isinstance(e, PdSubpatch))) == 2001
+
 
 class TestRenameSendsReceives:
     """Tests for rename_sends_receives function."""
@@ -1285,6 +1315,33 @@ class TestSplitStatements:
         assert len(stmts) == 2
         assert stmts[1] == "trailing"
 
+    def test_escaped_backslash_before_semicolon(self):
+        stmts = _split_statements(r"#X text 0 0 a\\;#X text 0 0 b;")
+        assert stmts == [r"#X text 0 0 a\\;", "#X text 0 0 b;"]
+
+    def test_trailing_lone_backslash(self):
+        stmts = _split_statements("a;b\\")
+        assert stmts == ["a;", "b\\"]
+
+
+class TestTokenize:
+    """Tests for _tokenize function."""
+
+    def test_basic(self):
+        assert _tokenize("#X obj 10 20 osc~ 440;") == ["#X", "obj", "10", "20", "osc~", "440"]
+
+    def test_tabs_and_repeated_spaces(self):
+        assert _tokenize("a \t  b\t") == ["a", "b"]
+
+    def test_escaped_separators_kept(self):
+        assert _tokenize(r"set \$1 \, bang\ x \;") == ["set", r"\$1", r"\,", r"bang\ x", r"\;"]
+
+    def test_newline_is_not_a_separator(self):
+        assert _tokenize("a\nb c") == ["a\nb", "c"]
+
+    def test_trailing_lone_backslash(self):
+        assert _tokenize("a b\\") == ["a", "b\\"]
+
 
 class TestParserRobustness:
     """Tests for parser handling of malformed input."""
@@ -1299,6 +1356,10 @@ class TestParserRobustness:
         with pytest.raises(ParseError):
             parse(content)
 
+    def test_non_numeric_connect_fields_default_to_zero(self):
+        content = "#N canvas 0 50 450 300 10;\n#X connect 2 x 3 1;"
+        assert parse(content).elements[0] == PdConnect(2, 0, 3, 1)
+
     def test_binary_garbage(self):
         content = b"\x00\x01\x02\xff\xfe".decode("utf-8", errors="replace")
         with pytest.raises(ParseError):
@@ -1375,6 +1436,7 @@ class TestGOPBridge:
         coords_elems = [e for e in subpatch.elements if isinstance(e, PdCoords)]
         assert len(coords_elems) == 1
         coords = coords_elems[0]
+        assert subpatch.coords is coords
         assert coords.graph_on_parent == 1
         assert coords.width == 120
         assert coords.height == 80
@@ -1405,6 +1467,58 @@ class TestGOPBridge:
         subpatch = ast.elements[0]
         coords_elems = [e for e in subpatch.elements if isinstance(e, PdCoords)]
         assert len(coords_elems) == 0
+        assert subpatch.coords is None
+
+    def test_subpatch_coords_first_with_gop_wins(self):
+        inner_canvas = CanvasProperties(0, 0, 400, 300, 10, "(subpatch)", 0)
+        inner_elements = [
+            PdCoords(0, 1, 1, 0, 90, 60, 0, 0, 0, 0),
+            PdCoords(0, 1, 1, 0, 150, 100, 1, 0, 0, 0),
+            PdObj(Position(50, 50), "inlet"),
+            PdCoords(0, 1, 1, 0, 200, 120, 1, 0, 0, 0),
+        ]
+        subpatch = PdSubpatch(inner_canvas, inner_elements, PdRestore(Position(0, 0), "s"))
+        assert subpatch.coords is inner_elements[1]
+
+        patch = to_builder(PdPatch(CanvasProperties(), [subpatch]))
+        assert patch.nodes[0].parameters["graph_on_parent"] is True
+        assert patch.nodes[0].parameters["gop_width"] == 150
+
+    def test_parse_records_subpatch_coords(self):
+        content = (
+            "#N canvas 0 0 400 300 12;\n"
+            "#N canvas 0 0 200 150 inner 0;\n"
+            "#X coords 0 1 1 0 90 60 0 0 0;\n"
+            "#X coords 0 1 1 0 150 100 1 0 0;\n"
+            "#X restore 10 10 pd inner;\n"
+            "#N canvas 0 0 200 150 plain 0;\n"
+            "#X restore 10 50 pd plain;\n"
+        )
+        ast = parse(content)
+        inner, plain = ast.elements
+        assert inner.coords is inner.elements[1]
+        assert plain.coords is None
+
+    def test_stale_subpatch_coords_ignored(self):
+        import dataclasses
+
+        inner_canvas = CanvasProperties(0, 0, 400, 300, 10, "(subpatch)", 0)
+        gop = PdCoords(0, 1, 1, 0, 150, 100, 1, 0, 0, 0)
+        subpatch = PdSubpatch(inner_canvas, [gop], PdRestore(Position(0, 0), "s"))
+        assert subpatch.coords is gop
+
+        replaced = dataclasses.replace(subpatch, elements=[])
+        assert replaced == PdSubpatch(inner_canvas, [], PdRestore(Position(0, 0), "s"))
+        patch = to_builder(PdPatch(CanvasProperties(), [replaced]))
+        assert patch.nodes[0].parameters["graph_on_parent"] is False
+
+        subpatch.elements.clear()
+        patch = to_builder(PdPatch(CanvasProperties(), [subpatch]))
+        assert patch.nodes[0].parameters["graph_on_parent"] is False
+
+        subpatch.elements.append(PdCoords(0, 1, 1, 0, 90, 60, 1, 0, 0, 0))
+        patch = to_builder(PdPatch(CanvasProperties(), [subpatch]))
+        assert patch.nodes[0].parameters["gop_width"] == 90
 
     def test_gop_to_builder(self):
         # Build an AST with a subpatch containing PdCoords
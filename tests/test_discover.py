@@ -1,6 +1,7 @@
 """Tests for py2pd.discover module."""
 
 import os
+import sys
 import tempfile
 
 import pytest
@@ -54,6 +55,17 @@ class TestDiscoverExternals:
             registry = discover_externals([tmpdir], include_defaults=False)
             assert registry["multi"] == (2, 3)
 
+    def test_discover_pd_non_utf8_comment(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pd_content = (
+                b"#N canvas 0 50 450 300 10;\n#X text 10 10 caf\xe9;\n#X obj 50 50 inlet;\n"
+            )
+            with open(os.path.join(tmpdir, "latin.pd"), "wb") as f:
+                f.write(pd_content)
+
+            registry = discover_externals([tmpdir], include_defaults=False)
+            assert registry["latin"] == (1, 0)
+
     def test_discover_binary_externals(self):
         platform = _platform_key()
         from py2pd.discover import _EXTERNAL_EXTENSIONS
@@ -72,6 +84,17 @@ class TestDiscoverExternals:
             assert "reverb" in registry
             assert registry["reverb"] == (None, None)
 
+    def test_binary_extensions_follow_sys_platform(self, monkeypatch):
+        monkeypatch.setattr(sys, "platform", "win32")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for filename in ("chorus.dll", "flanger.pd_linux"):
+                with open(os.path.join(tmpdir, filename), "w") as f:
+                    f.write("")
+
+            registry = discover_externals([tmpdir], include_defaults=False)
+            assert "chorus" in registry
+            assert "flanger" not in registry
+
     def test_first_found_wins(self):
         with tempfile.TemporaryDirectory() as dir1, tempfile.TemporaryDirectory() as dir2:
             # Create same-named .pd file in both dirs with different IO
@@ -178,3 +201,18 @@ class TestExtractDeclarePaths:
         patch = parse(content)
         paths = extract_declare_paths(patch)
         assert paths == ["/a", "/b", "/c"]
+
+    def test_extract_nested_subpatch_order(self):
+        content = (
+            "#N canvas 0 50 1000 600 10;\n"
+            "#X declare -path /first;\n"
+            "#N canvas 0 0 300 200 outer 0;\n"
+            "#N canvas 0 0 300 200 inner 0;\n"
+            "#X declare -path /inner;\n"
+            "#X restore 10 10 pd inner;\n"
+            "#X declare -path /outer;\n"
+            "#X restore 100 100 pd outer;\n"
+            "#X declare -path /last;"
+        )
+        patch = parse(content)
+        assert extract_declare_paths(patch) == ["/first", "/inner", "/outer", "/last"]
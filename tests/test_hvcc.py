@@ -1,11 +1,13 @@
 """Tests for py2pd.hvcc -- hvcc integration module."""
 
+import os
 import shutil
+import sys
 
 import pytest
 
 from py2pd.api import Patcher
-from py2pd.ast import CanvasProperties, PdObj, PdPatch, PdSubpatch, Position
+from py2pd.ast import CanvasProperties, PdObj, PdPatch, PdSubpatch, Position, parse
 from py2pd.integrations.hvcc import (
     HVCC_MIDI_GENERATORS,
     HVCC_MIDI_OBJECTS,
@@ -16,6 +18,7 @@ from py2pd.integrations.hvcc import (
     HvccError,
     HvccGenerator,
     HvccUnsupportedError,
+    HvccValidationResult,
     _check_object_supported,
     compile_hvcc,
     validate_for_hvcc,
@@ -107,6 +110,15 @@ class TestHvccSupportedObjects:
         assert "inlet~" in HVCC_SUPPORTED_OBJECTS
         assert "outlet~" in HVCC_SUPPORTED_OBJECTS
 
+    def test_registry_names_are_interned(self):
+        for name in HVCC_SUPPORTED_OBJECTS | HVCC_MIDI_OBJECTS:
+            assert sys.intern(name) is name
+
+    def test_parsed_class_name_matches_registry_entry(self):
+        patch = parse("#N canvas 0 0 450 300 10;\n#X obj 10 10 osc~ 440;")
+        class_name = patch.elements[0].class_name
+        assert any(name is class_name for name in HVCC_SUPPORTED_OBJECTS)
+
 
 # =========================================================================
 # _check_object_supported tests
@@ -156,6 +168,12 @@ class TestCheckObjectSupported:
         # At least one MIDI-capable generator = ok
         assert _check_object_supported("notein", [HvccGenerator.C, HvccGenerator.DPF]) == []
 
+    def test_midi_with_string_generators(self):
+        assert _check_object_supported("notein", ["c", "dpf"]) == []
+        errs = _check_object_supported("notein", ["c", "js"])
+        assert len(errs) == 1
+        assert "generators are: c, js" in errs[0]
+
     def test_non_midi_unaffected_by_generators(self):
         assert _check_object_supported("osc~", [HvccGenerator.C]) == []
         assert _check_object_supported("+", [HvccGenerator.JS]) == []
@@ -254,6 +272,54 @@ class TestValidateForHvcc:
         assert not result.ok
         assert any("vline~" in e for e in result.errors)
 
+    def test_errors_in_document_order(self):
+        inner = Patcher()
+        inner.add("vline~")
+        p = Patcher()
+        p.add("bob~ 100")
+        p.add_subpatch("sub", inner)
+        p.add("fft~")
+        result = validate_for_hvcc(p)
+        assert result.errors == [
+            "unsupported object: bob~",
+            "unsupported object: vline~",
+            "unsupported object: fft~",
+        ]
+
+    def test_fail_fast_stops_at_first_error(self):
+        inner = Patcher()
+        inner.add("vline~")
+        p = Patcher()
+        p.add("osc~ 440")
+        p.add_subpatch("sub", inner)
+        p.add("bob~ 100")
+        result = validate_for_hvcc(p, fail_fast=True)
+        assert not result.ok
+        assert result.errors == ["unsupported object: vline~"]
+
+    def test_fail_fast_clean_patch_ok(self):
+        p = Patcher()
+        p.add("osc~ 440")
+        p.add("dac~")
+        assert validate_for_hvcc(p, fail_fast=True).ok
+
+    def test_deeply_nested_builder_subpatches(self):
+        inner = Patcher()
+        inner.add("bob~ 100")
+        for _ in range(2000):
+            outer = Patcher()
+            outer.add_subpatch("sub", inner)
+            inner = outer
+        result = validate_for_hvcc(inner)
+        assert result.errors == ["unsupported object: bob~"]
+
+    def test_deeply_nested_ast_subpatches(self):
+        elements: list = [PdObj(Position(10, 10), "vline~")]
+        for _ in range(2000):
+            elements = [PdSubpatch(canvas=CanvasProperties(name="sub"), elements=elements)]
+        result = validate_for_hvcc(PdPatch(canvas=CanvasProperties(), elements=elements))
+        assert result.errors == ["unsupported object: vline~"]
+
     def test_gui_objects_pass(self):
         p = Patcher()
         p.add_bang()
@@ -294,6 +360,12 @@ class TestHeavyPatcher:
             p.add("bob~ 200")
         assert "bob~" in exc_info.value.unsupported
 
+    def test_add_checks_first_word_only(self):
+        p = HeavyPatcher()
+        with pytest.raises(HvccUnsupportedError) as exc_info:
+            p.add("  bob~\t200 osc~")
+        assert exc_info.value.unsupported == ["bob~"]
+
     def test_inherited_methods_work(self):
         p = HeavyPatcher()
         osc = p.add("osc~ 440")
@@ -481,6 +553,39 @@ class TestCompileHvccUnit:
         assert r.stdout == ""
         assert r.stderr == ""
 
+    def test_result_dataclasses_have_no_instance_dict(self):
+        assert not hasattr(HvccCompileResult(ok=True, output_dir="/tmp/out"), "__dict__")
+        assert not hasattr(HvccValidationResult(ok=True), "__dict__")
+
+    def test_runs_hvcc_cli_with_stubbed_subprocess(self, monkeypatch, tmp_path):
+        """compile_hvcc builds the command and parses stderr without hvcc installed."""
+        import subprocess
+        import types
+
+        monkeypatch.setitem(sys.modules, "hvcc", types.ModuleType("hvcc"))
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            with open(cmd[1]) as f:
+                assert "osc~ 440" in f.read()
+            return subprocess.CompletedProcess(cmd, 1, "out", "Warning: w\nError: e\n")
+
+        monkeypatch.setattr(subprocess, "run", fake_run)
+
+        p = Patcher()
+        p.add("osc~ 440")
+        result = compile_hvcc(p, output_dir=str(tmp_path), name="sine", search_paths=["/x"])
+
+        cmd = calls[0]
+        assert cmd[0] == "hvcc"
+        assert cmd[2:] == ["-o", str(tmp_path), "-n", "sine", "-g", "c", "-p", "/x"]
+        assert not result.ok
+        assert result.errors == ["Error: e"]
+        assert result.warnings == ["Warning: w"]
+        assert result.stdout == "out"
+        assert not os.path.exists(cmd[1])
+
 
 # =========================================================================
 # Integration tests (skip if hvcc not installed)
@@ -69,6 +69,14 @@ class TestPrintAccumulator:
         acc("\n\n")
         assert acc.lines == []
 
+    def test_many_lines_in_one_fragment(self):
+        acc = _PrintAccumulator()
+        acc("".join(f"line {i}\n" for i in range(10000)) + "tail")
+        assert len(acc.lines) == 10000
+        assert acc.lines[-1] == "line 9999"
+        acc.flush()
+        assert acc.lines[-1] == "tail"
+
     def test_mixed_fragments_and_newlines(self):
         acc = _PrintAccumulator()
         acc("a\nb")
@@ -113,6 +121,11 @@ class TestClassifyMessages:
         assert len(errors) == 0
         assert len(warnings) == 0
 
+    def test_pattern_split_across_lines_ignored(self):
+        errors, warnings = _classify_messages(["no such", "object", "warning", ":"])
+        assert errors == []
+        assert warnings == []
+
     def test_mixed(self):
         lines = [
             "print: ok",
@@ -130,6 +143,12 @@ class TestClassifyMessages:
         assert len(errors) == 1
         assert len(warnings) == 1
 
+    def test_error_takes_precedence_over_warning(self):
+        lines = ["warning: deprecated object couldn't create"]
+        errors, warnings = _classify_messages(lines)
+        assert errors == lines
+        assert warnings == []
+
     def test_empty(self):
         errors, warnings = _classify_messages([])
         assert errors == []
@@ -182,6 +201,10 @@ class TestValidationResult:
         assert len(r.warnings) == 1
         assert len(r.log) == 2
 
+    def test_has_no_instance_dict(self):
+        r = ValidationResult(ok=True)
+        assert not hasattr(r, "__dict__")
+
 
 class TestImportErrorWithoutCypd:
     """Test that validate_patch raises ImportError when cypd is missing."""
@@ -211,6 +234,51 @@ class TestImportErrorWithoutCypd:
             validate_patch(p)
 
 
+class TestValidatePatchWithStubbedCypd:
+    """Exercise validate_patch end to end against a stand-in cypd module."""
+
+    def test_loads_temp_patch_and_classifies_output(self, monkeypatch):
+        import os
+        import sys
+        import types
+
+        import py2pd.integrations.cypd as mod
+
+        opened = []
+        fake = types.ModuleType("cypd")
+        fake.init = lambda: None
+        fake.init_audio = lambda *args: None
+        fake.clear_search_path = lambda: None
+        fake.add_to_search_path = lambda path: None
+        fake.exists = lambda name: False
+        fake.close_patch = lambda patch_id: None
+
+        def set_print_callback(callback):
+            fake.print_callback = callback
+
+        def open_patch(name, directory):
+            path = os.path.join(directory, name)
+            with open(path) as f:
+                assert "osc~ 440" in f.read()
+            opened.append(path)
+            fake.print_callback("bob~ 1\n... couldn't create\n")
+            return 1
+
+        fake.set_print_callback = set_print_callback
+        fake.open_patch = open_patch
+        monkeypatch.setitem(sys.modules, "cypd", fake)
+        monkeypatch.setattr(mod, "_libpd_initialized", False)
+
+        p = Patcher()
+        p.add("osc~ 440")
+        result = mod.validate_patch(p, include_default_paths=False, check_receivers=["missing"])
+
+        assert not result.ok
+        assert result.errors == ["... couldn't create", "receiver not found: missing"]
+        assert result.log == ["bob~ 1", "... couldn't create"]
+        assert not os.path.exists(opened[0])
+
+
 # =========================================================================
 # Integration tests -- require cypd
 # =========================================================================